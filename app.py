@@ -2,9 +2,24 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import altair as alt
-from PIL import Image
+from matplotlib.figure import Figure
+import io
 import os
 
+from dinamica import (
+    DRIVE_TYPES, Vehicle, Engine, rated_engine, traction_curves, simulate_acceleration,
+    parked_level_loads, parked_grade_loads, grade_rollover_angle,
+    banked_loads, banked_limits, braking_decelerations, trailer_loads,
+    max_launch_grade, max_trailer_mass, max_cg_height_grade, max_cg_height_bank,
+    cornering_loads, cornering_limits, cornering_map, max_cornering_speed, tire_cornering_limit,
+    ideal_braking_curve, installed_braking_curve, lock_lines, brake_lock, optimize_brake_bias,
+    MagicFormulaTire, BrushTire, tire_braking_decelerations, tire_brake_lock,
+    articulated_loads, car_trailer_units, lttb_indices,
+    DESIGN_BOUNDS, evaluate_designs, pareto_optimize,
+    memoize, cache_stats,
+    begin_rerun, set_mode, end_rerun, stage, timed, stage_stats, prometheus_text, serve_metrics, enable_json_log,
+)
+
 # Configuração da Página
 st.set_page_config(
     page_title="Dinâmica Veicular - Atividade 02",
@@ -12,67 +27,297 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- FUNÇÕES AUXILIARES E CLASSE VEÍCULO ---
-class Vehicle:
-    def __init__(self, M, L, b, c, h, Af, Cd, fr, rho, drive_type, tire_radius, gear_ratios, final_drive, eta_d):
-        self.M = M
-        self.g = 9.81
-        self.W = M * self.g
-        self.L = L
-        self.b = b
-        self.c = c
-        self.h = h
-        self.Af = Af
-        self.Cd = Cd
-        self.fr = fr
-        self.rho = rho
-        self.drive_type = drive_type
-        self.tire_radius = tire_radius
-        self.gear_ratios = gear_ratios
-        self.final_drive = final_drive
-        self.eta_d = eta_d
-
-    def dynamic_loads(self, ax, theta_rad):
-        # ax positivo = aceleração, negativo = frenagem
-        W = self.W
-        L, c, b, h = self.L, self.c, self.b, self.h
-        
-        # Cargas Estáticas na rampa (sem inércia)
-        Wf_stat = (c / L) * W * np.cos(theta_rad) - (h / L) * W * np.sin(theta_rad)
-        Wr_stat = (b / L) * W * np.cos(theta_rad) + (h / L) * W * np.sin(theta_rad)
-
-        # Transferência de Carga Longitudinal devido à aceleração ax
-        Delta_W_inertia = (h / L) * (ax * self.M)
-        
-        Wf = Wf_stat - Delta_W_inertia
-        Wr = Wr_stat + Delta_W_inertia
-        
-        return Wf, Wr
-
-    def max_tractive_force(self, Wf, Wr, mu):
-        if self.drive_type == 'FWD (Tração Dianteira)':
-            Fmax = mu * Wf
-        elif self.drive_type == 'RWD (Tração Traseira)':
-            Fmax = mu * Wr
-        elif self.drive_type == 'AWD (Tração Integral)':
-            Fmax = mu * (Wf + Wr) 
-        else:
-            Fmax = 0
-        return Fmax
+# Instrumentação: cada rerun é cronometrado por etapa (cálculo, dados, gráfico, E/S).
+# DINAMICA_METRICS_PORT sobe /metrics no formato do Prometheus (uma vez por processo) e
+# DINAMICA_METRICS_LOG=1 emite uma linha JSON por rerun no stderr.
+begin_rerun()
+if os.environ.get("DINAMICA_METRICS_LOG"):
+    enable_json_log()
+metrics_error = None
+if os.environ.get("DINAMICA_METRICS_PORT"):
+    try:
+        serve_metrics(int(os.environ["DINAMICA_METRICS_PORT"]))
+    except (OSError, ValueError) as exc:
+        metrics_error = exc
+
+# --- FUNÇÕES AUXILIARES ---
+# Pontos por série enviados ao navegador: as varreduras podem ter qualquer resolução,
+# cada série é reduzida com LTTB (preserva picos e cantos) a este orçamento de pixels.
+# Com as mesmas entradas o DataFrame sai idêntico do cache, e o Streamlit troca
+# mensagens grandes repetidas por uma referência (hash): gráfico que não mudou não trafega.
+PIXEL_BUDGET = 300
+
+@memoize(maxsize=512)
+def series_points(x, y, max_points):
+    # Série reduzida (x, y e índice de cada ponto mantido na série original), em cache pelo
+    # conteúdo: num rerun só as séries que mudaram são recalculadas
+    idx = lttb_indices(x, y, max_points)
+    return x[idx], y[idx], idx
+
+@timed(kind='data')
+def long_frame(x_label, x, y_label, hue_label, series, max_points=PIXEL_BUDGET, index_label=None):
+    # Monta um DataFrame "longo" (x, y, série) direto das colunas, sem lista de dicts.
+    # series: {nome: y} sobre o x comum, ou {nome: (x, y)} com x próprio por série.
+    # index_label: coluna extra com o índice da amostra na série original, para ordenar
+    # curvas em que x não é monótono (order= do Altair).
+    xs, ys, idxs = [], [], []
+    for values in series.values():
+        sx, sy = values if isinstance(values, tuple) else (x, values)
+        sx, sy = np.broadcast_arrays(np.asarray(sx, dtype=float), np.asarray(sy, dtype=float))
+        sx, sy, idx = series_points(sx, sy, max_points)
+        xs.append(sx)
+        ys.append(sy)
+        idxs.append(idx)
+    columns = {x_label: np.concatenate(xs), y_label: np.concatenate(ys)}
+    if index_label is not None:
+        columns[index_label] = np.concatenate(idxs)
+    columns[hue_label] = pd.Categorical(np.repeat(list(series.keys()), [len(sx) for sx in xs]), categories=list(series.keys()))
+    return pd.DataFrame(columns)
+
+# --- CÁLCULOS EM CACHE ---
+# O Streamlit reexecuta o script a cada interação; com as mesmas entradas os
+# resultados (varreduras, DataFrames, imagem decodificada) vêm do cache. Vehicle é
+# imutável e tem hash pelo conteúdo, então entra direto na chave.
+@timed(kind='io')
+@memoize(maxsize=16)
+def load_image(path):
+    # Bytes do arquivo (o navegador decodifica); FileNotFoundError se não existir
+    with open(path, 'rb') as f:
+        return f.read()
+
+@timed()
+@memoize(maxsize=16)
+def make_engine(engine):
+    # engine: ('catalogo', torque_max, rpm_torque_max, cv, rpm_potencia, rpm_corte)
+    # ou ('arquivo', bytes da curva de plena carga, bytes do mapa BSFC ou None)
+    if engine[0] == 'arquivo':
+        full_load, bsfc = engine[1], engine[2]
+        return Engine.from_csv(io.BytesIO(full_load), io.BytesIO(bsfc) if bsfc else None)
+    return rated_engine(*engine[1:])
+
+TIRE_MODELS = ["μ constante", "Magic Formula (Pacejka)", "Escova (Brush)"]
+
+@timed()
+@memoize(maxsize=16)
+def make_tire(tire):
+    # tire: None (μ constante) ou (modelo, Fz0, sensibilidade à carga, kx, ky)
+    if tire is None:
+        return None
+    model, Fz0, load_sensitivity, kx, ky = tire
+    cls = MagicFormulaTire if model == TIRE_MODELS[1] else BrushTire
+    return cls(Fz0=Fz0, load_sensitivity=load_sensitivity, kx=kx, ky=ky)
+
+@timed()
+@memoize(maxsize=256)
+def transfer_frame(vehicle, theta_rad, mu):
+    accel_range = np.linspace(0, 5, 500)  # De 0 a 5 m/s²
+    sweep = vehicle.batch_loads(accel_range, theta_rad, mu)
+    return long_frame('Aceleração (m/s²)', accel_range, 'Carga (N)', 'Eixo',
+                      {'Dianteiro (Wf)': sweep['Wf'], 'Traseiro (Wr)': sweep['Wr']})
+
+@timed()
+@memoize(maxsize=256)
+def traction_frame(vehicle, mu, engine, tire=None):
+    eng = make_engine(engine)
+    rpm = np.linspace(eng.rpm_idle, eng.rpm_limit, 2000)
+    torque_motor = eng.full_load(rpm)
+    Wf_flat, Wr_flat = vehicle.dynamic_loads(0, 0)
+    F_limit_flat = vehicle.max_tractive_force(Wf_flat, Wr_flat, mu, tire=make_tire(tire))
+    v_kmh, ft = traction_curves(vehicle, rpm, torque_motor, F_limit_flat)
+    return long_frame('Vel (km/h)', None, 'Força (N)', 'Marcha',
+                      {f"{i+1}ª": (v_kmh[i], ft[i]) for i in range(len(v_kmh))})
+
+@timed()
+@memoize(maxsize=64)
+def shift_points(vehicle, engine):
+    # Rotação e velocidade (km/h) da troca ótima em cada marcha
+    rpm_shift = make_engine(engine).optimal_shift_points(vehicle.gear_ratios)
+    ratios = np.asarray(vehicle.gear_ratios[:-1])
+    v_kmh = rpm_shift * 2 * np.pi / 60 * vehicle.tire_radius / (ratios * vehicle.final_drive) * 3.6
+    return rpm_shift, v_kmh
+
+@timed()
+@memoize(maxsize=64)
+def launch_simulation(vehicle, mu, engine, theta_rad, shift_rpm=None, tire=None):
+    sim = simulate_acceleration(vehicle, mu, theta_rad=theta_rad, shift_rpm=shift_rpm,
+                                record=True, engine=make_engine(engine), tire=make_tire(tire))
+    with stage('launch_frame', 'data'):
+        idx = lttb_indices(sim['t'], sim['v'][:, 0], PIXEL_BUDGET)
+        gear = sim['gear'][idx, 0]
+        df_sim = pd.DataFrame({
+            'Tempo (s)': sim['t'][idx],
+            'Vel (km/h)': sim['v'][idx, 0] * 3.6,
+            'Marcha': pd.Categorical.from_codes(gear, [f"{i+1}ª" for i in range(gear.max() + 1)]),
+        })
+    return sim, df_sim
+
+@timed()
+@memoize(maxsize=64)
+def tire_frames(tire, mu, loads):
+    # Curvas do pneu nas cargas por roda dadas: Fx(κ), Fy(α) e a elipse de atrito
+    # (Fx x Fy varrendo κ com α fixo), todas de uma vez
+    model = make_tire(tire)
+    loads = np.asarray(loads, dtype=float)
+    kappa = np.linspace(-1.0, 1.0, 2001)
+    alpha = np.radians(np.linspace(-20, 20, 2001))
+    Fx = model.longitudinal(loads[:, None], kappa, mu)
+    Fy = model.lateral(loads[:, None], alpha, mu)
+    names = [f"Fz = {Fz:.0f} N" for Fz in loads]
+    df_x = long_frame('κ', kappa, 'Fx (N)', 'Carga', dict(zip(names, Fx)))
+    df_y = long_frame('α (°)', np.degrees(alpha), 'Fy (N)', 'Carga', dict(zip(names, Fy)))
+    alphas = np.array([1.0, 2.0, 4.0, 8.0])
+    ex, ey = model.forces(loads[0], kappa, np.radians(alphas)[:, None], mu)
+    df_e = long_frame('Fx (N)', None, 'Fy (N)', 'α', {f"α = {a:g}°": (ex[i], ey[i]) for i, a in enumerate(alphas)},
+                      index_label='Amostra')
+    return df_x, df_y, df_e
+
+@timed()
+@memoize(maxsize=256)
+def grade_frame(W, L, b, c, h):
+    lim_angle = grade_rollover_angle(c, h)
+    angles = np.linspace(0, lim_angle + 10, 500) # Vai um pouco além do limite
+    wf_i, wr_i = parked_grade_loads(W, L, b, c, h, np.radians(angles))
+    # Trava em zero para gráfico ficar bonito
+    wf_i = np.maximum(wf_i, 0)
+    return long_frame('Ângulo (°)', angles, 'Carga (N)', 'Eixo',
+                      {'Dianteiro': wf_i, 'Traseiro': wr_i})
+
+@timed()
+@memoize(maxsize=256)
+def banked_frame(W, t, h, lim_tomb):
+    angles_lat = np.linspace(0, min(lim_tomb + 10, 60), 500)
+    w_l, w_h = banked_loads(W, t, h, np.radians(angles_lat))
+    w_h = np.maximum(w_h, 0)
+    return long_frame('Ângulo (°)', angles_lat, 'Carga (N)', 'Roda',
+                      {'Externa (Baixa)': w_l, 'Interna (Alta)': w_h})
+
+@timed()
+@memoize(maxsize=256)
+def brake_frame(vehicle, dec_ideal, trad):
+    decel_range = np.linspace(0, dec_ideal, 20)
+    # ax é negativo na frenagem para a fórmula dynamic_loads
+    wf_b, wr_b = vehicle.dynamic_loads(-decel_range, trad)
+    return long_frame('Desaceleração (m/s²)', decel_range, 'Carga (N)', 'Eixo',
+                      {'Dianteiro': wf_b, 'Traseiro': wr_b})
+
+@timed(kind='chart')
+@memoize(maxsize=32)
+def cornering_heatmap(W, L, b, c, t, h, ty, mu_lat, phi_rad, v_max_kmh, R_min, R_max, resolution, tire=None):
+    # Mapa (raio x velocidade) da utilização do limite lateral, renderizado em PNG.
+    # A grade inteira é avaliada de uma vez; o PNG (e não a figura) fica no cache.
+    v_kmh = np.linspace(0, v_max_kmh, resolution)
+    R = np.linspace(R_min, R_max, resolution)
+    with stage('cornering_map'):
+        m = cornering_map(W, L, b, c, t, h, ty, mu_lat, v_kmh[:, None] / 3.6, R[None, :], phi_rad, tire=make_tire(tire))
+
+    fig = Figure(figsize=(9, 4.5))
+    ax = fig.subplots()
+    im = ax.imshow(np.clip(m['utilization'], 0, 1.5), origin='lower', aspect='auto',
+                   extent=[R_min, R_max, 0, v_max_kmh], cmap='RdYlGn_r', vmin=0, vmax=1.5)
+    # Com ϕ escalar os limites são iguais em todas as linhas da grade
+    ay_max, ay_min = np.minimum(m['ay_roll'], m['ay_slide'])[0], m['ay_min'][0]
+    ax.plot(R, np.sqrt(R * ay_max) * 3.6, 'k--', label='Velocidade máxima')
+    if (ay_min > 0).any():
+        ax.plot(R, np.sqrt(R * ay_min) * 3.6, 'k:', label='Velocidade mínima')
+    ax.set_ylim(0, v_max_kmh)
+    ax.set_xlabel('Raio (m)')
+    ax.set_ylabel('Velocidade (km/h)')
+    ax.legend(loc='upper left')
+    fig.colorbar(im, ax=ax, label='Utilização do limite lateral')
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=110, bbox_inches='tight')
+    return buf.getvalue()
+
+@timed()
+@memoize(maxsize=256)
+def brake_balance_frame(W, L, b, c, h, mu_b, beta, knee, slope):
+    # Curva ideal, curva instalada e retas de travamento no plano (Fbf, Fbr)
+    z = np.linspace(0, 1.2, 1000)
+    Fbf_ideal, Fbr_ideal = ideal_braking_curve(W, L, b, c, h, z)
+    Fbf = np.linspace(0, Fbf_ideal.max(), 1000)
+    Fbr_inst = installed_braking_curve(Fbf / W, beta, knee, slope) * W
+    Fbr_front, Fbr_rear = lock_lines(W, L, b, c, h, mu_b, Fbf)
+    curves = {
+        'Ideal': (Fbf_ideal, Fbr_ideal),
+        'Instalada': (Fbf, Fbr_inst),
+        f'Trava Dianteira (μ={mu_b:.2f})': (Fbf, Fbr_front),
+        f'Trava Traseira (μ={mu_b:.2f})': (Fbf, Fbr_rear),
+    }
+    df = long_frame('Fbf (N)', None, 'Fbr (N)', 'Curva', curves)
+    return df[(df['Fbr (N)'] >= 0) & (df['Fbr (N)'] <= Fbr_ideal.max() * 1.2)]
+
+@timed()
+@memoize(maxsize=32)
+def brake_bias_optimum(M, L, b, h):
+    # Envelope de projeto: mu 0.2–1.0, rampa ±20°, carga 0–400 kg
+    mu_env = np.linspace(0.2, 1.0, 40)[None, None, :]
+    theta_env = np.radians(np.linspace(-20, 20, 25))[:, None, None]
+    payload_env = np.linspace(0, 400, 30)[:, None]
+    fixed = optimize_brake_bias(M, L, b, h, mu_env, theta_env, payload_env)
+    staged = optimize_brake_bias(M, L, b, h, mu_env, theta_env, payload_env,
+                                 betas=np.linspace(0.55, 0.90, 36), knees=np.linspace(0.1, 0.8, 15),
+                                 slopes=np.linspace(0.0, 0.6, 13))
+    return fixed, staged
+
+@timed()
+@memoize(maxsize=64)
+def articulated_frame(M, L, b, h, Mt, Lt, lt_cg, lh, h_t, z_hitch, theta_rad, trailer_brakes):
+    # Cargas do conjunto carro + reboque numa varredura de ax (um único solve em lote)
+    ax = np.linspace(-8, 3, 111)
+    units = car_trailer_units(M, L, b, h, Mt, Lt, lt_cg, lh, h_t, z_hitch)
+    share = np.array([0.5, 0.5, 0.0]) if not trailer_brakes else np.array([M, M, 2 * Mt]) / (2 * (M + Mt))
+    # Em aceleração só o carro traciona (dianteiro/traseiro em partes iguais)
+    res = articulated_loads(units, theta_rad, ax, np.where(ax[:, None] < 0, share, [0.5, 0.5, 0.0]))
+    N = res['N']
+    return long_frame('ax (m/s²)', ax, 'Carga (N)', 'Eixo', {
+        'Carro Dianteiro': N[:, 0], 'Carro Traseiro': N[:, 1], 'Reboque': N[:, 2],
+        'Engate (vertical)': res['V_hitch'][:, 0], 'Engate (longitudinal)': res['H_hitch'][:, 0],
+    })
+
+OBJECTIVE_LABELS = {
+    'launch_grade': 'Rampa de Arrancada (°)', 'brake_efficiency': 'Eficiência de Frenagem',
+    'rollover_angle': 'Ângulo de Tombamento (°)', 't_0_100': '0–100 km/h (s)',
+    'drag_power': 'Potência de Arrasto (kW)',
+}
+DESIGN_LABELS = {
+    'L': 'L (m)', 'b_frac': 'b/L', 'h': 'h (m)', 't': 't (m)', 'Cd': 'Cd',
+    'final_drive': 'Diferencial', 'beta': 'β (dianteiro)',
+}
+
+@timed()
+@memoize(maxsize=16)
+def pareto_front(vehicle, engine, bounds, pop_size, generations, mu, t_ref):
+    # Front de Pareto viável como DataFrame (variáveis + objetivos com rótulos do app).
+    # t_ref = bitola do veículo da barra lateral, a mesma referência de área frontal
+    # usada para o marcador do projeto atual
+    res = pareto_optimize(vehicle, make_engine(engine), dict(bounds), pop_size=pop_size,
+                          generations=generations, mu=mu, t_ref=t_ref)
+    columns = {DESIGN_LABELS[k]: v for k, v in res['X'].items()}
+    columns.update({OBJECTIVE_LABELS[k]: v for k, v in res['objectives'].items()})
+    return pd.DataFrame(columns)
+
+def show_chart(name, chart, **kwargs):
+    # st.altair_chart cronometrado: serialização da spec e envio ao navegador
+    with stage(name, 'chart'):
+        st.altair_chart(chart, **kwargs)
+
+# Seletor de painel: ao contrário de st.tabs, só o painel escolhido é executado,
+# então os cálculos e gráficos dos outros painéis não rodam a cada interação
+def panel_selector(options, key):
+    return st.radio("Painel", options, horizontal=True, label_visibility="collapsed", key=key)
 
 # Função auxiliar para carregar imagens com segurança
 def show_jazar_image(filename, caption):
     with st.expander(f"📘 Ver Diagrama de Referência (Jazar): {caption}"):
-        if os.path.exists(filename):
-            st.image(filename, caption=caption, use_container_width=True)
-        else:
+        try:
+            st.image(load_image(filename), caption=caption, use_container_width=True)
+        except FileNotFoundError:
             st.warning(f"Imagem '{filename}' não encontrada. Adicione o print do livro na pasta.")
 
 # --- BARRA LATERAL ---
 with st.sidebar:
     try:
-        image = Image.open("chevrolet-onix-plus-lt-turbo-mt-2025-5.jpg")
-        st.image(image, caption='Chevrolet Onix Plus', use_container_width=True)
+        st.image(load_image("chevrolet-onix-plus-lt-turbo-mt-2025-5.jpg"), caption='Chevrolet Onix Plus', use_container_width=True)
     except:
         st.warning("Imagem do Onix não encontrada.")
 
@@ -98,6 +343,22 @@ with st.sidebar:
     Af = st.number_input("Área Frontal (m²)", value=2.1, step=0.1, format="%.1f")
     Cd = st.number_input("Coef. Arrasto (Cd)", value=0.32, step=0.01, format="%.2f")
     fr = st.number_input("Resist. Rolamento (fr)", value=0.015, step=0.001, format="%.3f")
+    tire_model = st.selectbox("Modelo de Pneu", TIRE_MODELS,
+                              help="μ constante: F = μ·N. Os modelos de pneu usam o pico da curva com μ caindo com a carga da roda (aceleração, frenagem e curva).")
+    tire_spec = None
+    if tire_model != TIRE_MODELS[0]:
+        with st.expander("Parâmetros do Pneu"):
+            Fz0 = st.number_input("Carga Nominal Fz0 (N)", value=3000.0, step=100.0)
+            load_sens = st.slider("Sensibilidade à Carga (Δμ/μ por Fz0)", -0.30, 0.0, -0.10, 0.01)
+            kx = st.number_input("Rigidez Longitudinal (Kx/Fz)", value=20.0, step=1.0)
+            ky = st.number_input("Rigidez de Deriva (Ky/Fz0, 1/rad)", value=16.0, step=1.0)
+        tire_spec = (tire_model, Fz0, load_sens, kx, ky)
+    tire = make_tire(tire_spec)
+
+    st.markdown("---")
+    show_profile = st.checkbox("🩺 Painel de Desempenho", help="Tempo de cada etapa deste rerun e contadores acumulados.")
+    if metrics_error is not None:
+        st.warning(f"Servidor de métricas não iniciado: {metrics_error}")
 
 # --- CORPO PRINCIPAL ---
 st.title("🚗 Simulador de Dinâmica Veicular")
@@ -111,14 +372,17 @@ analysis_mode = st.selectbox(
         "🅿️ Veículo Parado (Plano e Inclinado)",
         "🔄 Veículo em Curva (Banked Road)",
         "🛑 Frenagem (Ideal e Eixo Simples)",
-        "🚛 Veículo com Trailer (Inclinado)"
+        "🚛 Veículo com Trailer (Inclinado)",
+        "🧭 Otimização de Geometria (Pareto)"
     ],
     label_visibility="collapsed"
 )
+set_mode(analysis_mode)
 st.markdown("---")
 
-g = 9.81
-W = M * g
+# Veículo da barra lateral: geometria, aerodinâmica e rolamento. Cada modo troca o que
+# é dele (powertrain, tração) com replace(); peso e g vêm sempre daqui.
+vehicle = Vehicle(M, L, b, c, h, Af, Cd, fr, 1.225, DRIVE_TYPES[0], 0.30, (3.5, 2.1, 1.4, 1.0, 0.8), 4.0, 0.90)
 
 # ==============================================================================
 # MODO 1: ACELERAÇÃO
@@ -129,7 +393,7 @@ if analysis_mode == "🚗 Dinâmica Longitudinal (Aceleração)":
     with st.sidebar:
         st.markdown("---")
         st.markdown("### 🔧 Powertrain")
-        drive_type = st.selectbox("Tração", ['FWD (Tração Dianteira)', 'RWD (Tração Traseira)', 'AWD (Tração Integral)'])
+        drive_type = st.selectbox("Tração", DRIVE_TYPES)
         mu = st.slider("Coef. Atrito (μ)", 0.1, 1.2, 0.85, 0.05)
         
         with st.expander("Detalhes da Transmissão"):
@@ -149,11 +413,20 @@ if analysis_mode == "🚗 Dinâmica Longitudinal (Aceleração)":
             rpm_power_max = st.number_input("RPM Potência", 5500.0)
             rpm_limit = st.number_input("RPM Corte", 6500.0)
 
-    vehicle = Vehicle(M, L, b, c, h, Af, Cd, fr, 1.225, drive_type, tire_radius, gear_ratios, final_drive, eta_d)
+            st.caption("Opcional: curva de plena carga (CSV `rpm,torque`) e mapa BSFC em grade (CSV, 1ª linha = torque, 1ª coluna = rpm) substituem os dados acima.")
+            full_load_file = st.file_uploader("Curva de plena carga", type="csv")
+            bsfc_file = st.file_uploader("Mapa BSFC (g/kWh)", type="csv")
 
-    tab1, tab2 = st.tabs(["⛰️ Rampa e Limites", "📈 Gráficos de Desempenho"])
+    if full_load_file is not None:
+        engine = ('arquivo', full_load_file.getvalue(), bsfc_file.getvalue() if bsfc_file is not None else None)
+    else:
+        engine = ('catalogo', torque_max, rpm_torque_max, power_max_hp, rpm_power_max, rpm_limit)
+    vehicle = vehicle.replace(drive_type=drive_type, tire_radius=tire_radius, gear_ratios=gear_ratios,
+                              final_drive=final_drive, eta_d=eta_d)
 
-    with tab1:
+    panel = panel_selector(["⛰️ Rampa e Limites", "📈 Gráficos de Desempenho", "🏁 Arrancada (0–100)", "🛞 Pneu"], key="panel_accel")
+
+    if panel == "⛰️ Rampa e Limites":
         st.subheader("Modelo Matemático (Cargas Dinâmicas)")
         show_jazar_image("jazar_accel_grade.png", "Accelerating Car on an Inclined Road")
 
@@ -170,11 +443,11 @@ if analysis_mode == "🚗 Dinâmica Longitudinal (Aceleração)":
         k1, k2, k3 = st.columns(3)
         k1.metric("Carga Dianteira", f"{Wf_dyn:.0f} N")
         k2.metric("Carga Traseira", f"{Wr_dyn:.0f} N")
-        k3.metric("Peso Total", f"{W:.0f} N")
+        k3.metric("Peso Total", f"{vehicle.W:.0f} N")
 
         st.subheader("Limite de Tração")
-        F_trac_max = vehicle.max_tractive_force(Wf_dyn, Wr_dyn, mu)
-        F_resist_start = W * np.sin(theta_rad) + fr * W * np.cos(theta_rad)
+        F_trac_max = vehicle.max_tractive_force(Wf_dyn, Wr_dyn, mu, tire=tire)
+        F_resist_start = vehicle.W * np.sin(theta_rad) + fr * vehicle.W * np.cos(theta_rad)
         
         col_res1, col_res2 = st.columns(2)
         col_res1.metric("Tração Máxima Disp.", f"{F_trac_max:.0f} N")
@@ -185,6 +458,7 @@ if analysis_mode == "🚗 Dinâmica Longitudinal (Aceleração)":
             st.success(f"✅ Arranca com sucesso! Aceleração máx possível: {amax_possible:.2f} m/s²")
         else:
             st.error("❌ Patina na largada.")
+        st.caption(f"Rampa máxima de arrancada com μ = {mu:.2f}: **{np.degrees(max_launch_grade(vehicle, mu, tire=tire)):.1f}°**")
 
         # --- NOVO GRÁFICO: Transferência de Carga vs Aceleração e Inclinação ---
         st.markdown("---")
@@ -192,15 +466,7 @@ if analysis_mode == "🚗 Dinâmica Longitudinal (Aceleração)":
         st.caption(f"Este gráfico mostra como as cargas nos eixos variam conforme a aceleração aumenta, para a inclinação fixa definida acima ({theta_deg}°).")
 
         # Gerar dados simulados para uma faixa de acelerações
-        accel_range = np.linspace(0, 5, 50)  # De 0 a 5 m/s²
-        data_transfer = []
-
-        for ax_val in accel_range:
-            wf_i, wr_i = vehicle.dynamic_loads(ax_val, theta_rad)
-            data_transfer.append({'Aceleração (m/s²)': ax_val, 'Carga (N)': wf_i, 'Eixo': 'Dianteiro (Wf)'})
-            data_transfer.append({'Aceleração (m/s²)': ax_val, 'Carga (N)': wr_i, 'Eixo': 'Traseiro (Wr)'})
-
-        df_transfer = pd.DataFrame(data_transfer)
+        df_transfer = transfer_frame(vehicle, theta_rad, mu)
 
         # Criar gráfico interativo com Altair
         chart_transfer = alt.Chart(df_transfer).mark_line(strokeWidth=3).encode(
@@ -214,52 +480,86 @@ if analysis_mode == "🚗 Dinâmica Longitudinal (Aceleração)":
         rule_ax = alt.Chart(pd.DataFrame({'x': [ax_sim]})).mark_rule(color='red', strokeDash=[5,5]).encode(x='x')
         text_ax = alt.Chart(pd.DataFrame({'x': [ax_sim], 'y': [Wf_dyn], 'text': ['Ponto Atual']})).mark_text(align='left', dx=5, dy=-5, color='red').encode(x='x', y='y', text='text')
 
-        st.altair_chart(chart_transfer + rule_ax + text_ax, use_container_width=True)
+        show_chart("transfer_chart", chart_transfer + rule_ax + text_ax, use_container_width=True)
         st.info("💡 **Análise:** Note que ao aumentar o slider de *Ângulo da Rampa*, as linhas de carga inicial (Aceleração=0) se deslocam (peso vai para trás), alterando o ponto de partida das curvas.")
 
 
-    with tab2:
+    elif panel == "📈 Gráficos de Desempenho":
         st.subheader("Curvas de Força Trativa")
         show_jazar_image("jazar_accel_level.png", "Tractive Effort Diagram")
         
         # Gerar gráfico
-        rpm = np.linspace(800, rpm_limit, 100)
-        torque_motor = np.interp(rpm, [800, rpm_torque_max, rpm_power_max, rpm_limit], [torque_max*0.7, torque_max, torque_max*0.9, torque_max*0.6])
-        df_traction = pd.DataFrame()
-        Wf_flat, Wr_flat = vehicle.dynamic_loads(0, 0)
-        F_limit_flat = vehicle.max_tractive_force(Wf_flat, Wr_flat, mu)
-
-        for i, ratio in enumerate(gear_ratios):
-            v_kmh = ((rpm * 2 * np.pi / 60) * tire_radius / (ratio * final_drive)) * 3.6
-            ft = (torque_motor * ratio * final_drive * eta_d) / tire_radius
-            ft = np.minimum(ft, F_limit_flat)
-            df_g = pd.DataFrame({'Vel (km/h)': v_kmh, 'Força (N)': ft, 'Marcha': f"{i+1}ª"})
-            df_traction = pd.concat([df_traction, df_g])
+        df_traction = traction_frame(vehicle, mu, engine, tire_spec)
         
-        st.altair_chart(alt.Chart(df_traction).mark_line().encode(
+        rpm_shift, v_shift = shift_points(vehicle, engine)
+        rule_shift = alt.Chart(pd.DataFrame({'x': v_shift})).mark_rule(color='gray', strokeDash=[4, 4]).encode(x='x')
+        show_chart("traction_chart", (alt.Chart(df_traction).mark_line().encode(
             x='Vel (km/h)', y='Força (N)', color='Marcha', tooltip=['Marcha', 'Vel (km/h)', 'Força (N)']
+        ) + rule_shift).interactive(), use_container_width=True)
+        st.caption("Troca ótima (máxima força na roda): " + " · ".join(
+            f"{i+1}ª→{i+2}ª em {r:.0f} rpm ({v:.0f} km/h)" for i, (r, v) in enumerate(zip(rpm_shift, v_shift))))
+
+    elif panel == "🏁 Arrancada (0–100)":
+        st.subheader("Simulação de Arrancada com Troca de Marchas")
+        st.caption("Integração no tempo em plena carga: tração limitada pelo motor ou pelo atrito (com transferência de carga), trocando de marcha no corte de giro ou no ponto ótimo do motor.")
+
+        c1, c2 = st.columns(2)
+        theta_sim = c1.slider("Inclinação da Pista (°)", 0.0, 20.0, 0.0, 0.5)
+        shift_mode = c2.radio("Troca de Marcha", ["No corte de giro", "Ótima (máx. força)"], horizontal=True)
+        sim, df_sim = launch_simulation(vehicle, mu, engine, np.radians(theta_sim),
+                                        'optimal' if shift_mode == "Ótima (máx. força)" else None, tire_spec)
+
+        s1, s2, s3 = st.columns(3)
+        s1.metric("0–100 km/h", f"{sim['t_0_100'][0]:.2f} s" if np.isfinite(sim['t_0_100'][0]) else "—")
+        s2.metric("1/4 de Milha", f"{sim['t_quarter_mile'][0]:.2f} s" if np.isfinite(sim['t_quarter_mile'][0]) else "—")
+        s3.metric("Distância em 10 s", f"{sim['x_at_t'][0]:.0f} m" if np.isfinite(sim['x_at_t'][0]) else "—")
+
+        show_chart("launch_chart", alt.Chart(df_sim).mark_line().encode(
+            x='Tempo (s)', y='Vel (km/h)', color='Marcha', tooltip=['Tempo (s)', 'Vel (km/h)', 'Marcha']
         ).interactive(), use_container_width=True)
 
+    elif panel == "🛞 Pneu":
+        st.subheader("Curvas do Pneu: Escorregamento, Deriva e Elipse de Atrito")
+        if tire is None:
+            st.info("Com μ constante não há curva de escorregamento: escolha Magic Formula ou Escova em 'Modelo de Pneu' na barra lateral.")
+        else:
+            st.caption("Cargas por roda estáticas (dianteira e traseira) e o dobro da dianteira: o pico cresce menos que a carga (μ sensível à carga). "
+                       "A elipse mostra quanto de força lateral sobra ao tracionar ou frear com deriva fixa.")
+            Wf_stat, Wr_stat = vehicle.dynamic_loads(0.0, 0.0)
+            df_fx, df_fy, df_ellipse = tire_frames(tire_spec, mu, (Wf_stat / 2, Wr_stat / 2, Wf_stat))
+            p1, p2, p3 = st.columns(3)
+            for col, Fz in zip((p1, p2, p3), (Wf_stat / 2, Wr_stat / 2, Wf_stat)):
+                col.metric(f"μ de pico (Fz = {Fz:.0f} N)", f"{tire.peak_mu(Fz, mu):.3f}")
+            c1, c2 = st.columns(2)
+            with c1:
+                show_chart("tire_fx_chart", alt.Chart(df_fx).mark_line().encode(
+                    x='κ', y='Fx (N)', color='Carga', tooltip=['Carga', 'κ', 'Fx (N)']
+                ).interactive(), use_container_width=True)
+            with c2:
+                show_chart("tire_fy_chart", alt.Chart(df_fy).mark_line().encode(
+                    x='α (°)', y='Fy (N)', color='Carga', tooltip=['Carga', 'α (°)', 'Fy (N)']
+                ).interactive(), use_container_width=True)
+            show_chart("tire_ellipse_chart", alt.Chart(df_ellipse).mark_line().encode(
+                x='Fx (N)', y='Fy (N)', color='α', order='Amostra', tooltip=['α', 'Fx (N)', 'Fy (N)']
+            ).interactive(), use_container_width=True)
+
 # ==============================================================================
 # MODO 2: PARADO (Plano e Inclinado)
 # ==============================================================================
 elif analysis_mode == "🅿️ Veículo Parado (Plano e Inclinado)":
     st.header("🅿️ Veículo Parado")
 
-    tab_plano, tab_rampa = st.tabs(["Pista Plana (Cargas & Posição CG)", "Pista Inclinada (Limites)"])
+    panel = panel_selector(["Pista Plana (Cargas & Posição CG)", "Pista Inclinada (Limites)"], key="panel_parked")
 
-    with tab_plano:
+    if panel == "Pista Plana (Cargas & Posição CG)":
         st.subheader("Cargas Estáticas e Posição Lateral do CG")
         show_jazar_image("jazar_parked_level.png", "Parked Car on a Level Road")
 
-        Wf = W * (c/L)
-        Wr = W * (b/L)
-        W_left = W * (0.5 + ty/t)
-        W_right = W * (0.5 - ty/t)
+        Wf, Wr, W_left, W_right = parked_level_loads(vehicle.W, L, b, c, t, ty)
 
         c1, c2 = st.columns(2)
-        c1.metric("Eixo Dianteiro", f"{Wf:.1f} N", f"{(Wf/W)*100:.1f}%")
-        c2.metric("Eixo Traseiro", f"{Wr:.1f} N", f"{(Wr/W)*100:.1f}%")
+        c1.metric("Eixo Dianteiro", f"{Wf:.1f} N", f"{(Wf/vehicle.W)*100:.1f}%")
+        c2.metric("Eixo Traseiro", f"{Wr:.1f} N", f"{(Wr/vehicle.W)*100:.1f}%")
         
         st.divider()
         st.markdown("**Visualização da Distribuição Lateral:**")
@@ -272,25 +572,26 @@ elif analysis_mode == "🅿️ Veículo Parado (Plano e Inclinado)":
         chart_lat = alt.Chart(df_lat).mark_bar().encode(
             x='Lado', y='Carga (N)', color='Lado', tooltip=['Lado', 'Carga (N)']
         ).properties(height=300)
-        st.altair_chart(chart_lat, use_container_width=True)
+        show_chart("lateral_chart", chart_lat, use_container_width=True)
 
-    with tab_rampa:
+    elif panel == "Pista Inclinada (Limites)":
         st.subheader("Análise de Estabilidade na Rampa")
         show_jazar_image("jazar_parked_grade.png", "Parked Car on an Inclined Road")
 
         theta = st.slider("Inclinação da Rampa (°)", 0.0, 60.0, 15.0)
         trad = np.radians(theta)
         
-        Wf_inc = (W/L) * (c*np.cos(trad) - h*np.sin(trad))
-        Wr_inc = (W/L) * (b*np.cos(trad) + h*np.sin(trad))
+        Wf_inc, Wr_inc = parked_grade_loads(vehicle.W, L, b, c, h, trad)
         
-        lim_angle = np.degrees(np.arctan(c/h))
+        lim_angle = grade_rollover_angle(c, h)
         
         k1, k2, k3 = st.columns(3)
         k1.metric("W Dianteiro", f"{Wf_inc:.0f} N")
         k2.metric("W Traseiro", f"{Wr_inc:.0f} N")
         k3.metric("Limite Tombamento", f"{lim_angle:.1f}°")
 
+        if theta > 0:
+            st.caption(f"Altura máxima do CG antes de tombar nesta rampa: **{max_cg_height_grade(c, trad):.2f} m**")
         if theta > lim_angle:
             st.error("⚠️ ÂNGULO CRÍTICO EXCEDIDO! O veículo tombaria para trás.")
 
@@ -298,19 +599,7 @@ elif analysis_mode == "🅿️ Veículo Parado (Plano e Inclinado)":
         st.markdown("#### 📉 Gráfico: Cargas vs. Ângulo de Inclinação")
         st.caption("Observe como a carga no eixo dianteiro (azul) diminui até chegar a zero (ponto de tombamento).")
         
-        angles = np.linspace(0, lim_angle + 10, 50) # Vai um pouco além do limite
-        data_rampa = []
-        for ang in angles:
-            arad = np.radians(ang)
-            wf_i = (W/L) * (c*np.cos(arad) - h*np.sin(arad))
-            wr_i = (W/L) * (b*np.cos(arad) + h*np.sin(arad))
-            # Trava em zero para gráfico ficar bonito
-            if wf_i < 0: wf_i = 0
-            
-            data_rampa.append({'Ângulo (°)': ang, 'Carga (N)': wf_i, 'Eixo': 'Dianteiro'})
-            data_rampa.append({'Ângulo (°)': ang, 'Carga (N)': wr_i, 'Eixo': 'Traseiro'})
-        
-        df_rampa = pd.DataFrame(data_rampa)
+        df_rampa = grade_frame(vehicle.W, L, b, c, h)
         
         chart_rampa = alt.Chart(df_rampa).mark_line().encode(
             x='Ângulo (°)',
@@ -322,7 +611,7 @@ elif analysis_mode == "🅿️ Veículo Parado (Plano e Inclinado)":
         # Adiciona linha vertical no ângulo atual
         rule = alt.Chart(pd.DataFrame({'x': [theta]})).mark_rule(color='red', strokeDash=[5,5]).encode(x='x')
         
-        st.altair_chart(chart_rampa + rule, use_container_width=True)
+        show_chart("grade_chart", chart_rampa + rule, use_container_width=True)
 
 
 # ==============================================================================
@@ -336,46 +625,76 @@ elif analysis_mode == "🔄 Veículo em Curva (Banked Road)":
     mu_lat = st.slider("Atrito Lateral", 0.1, 1.2, 0.8)
     prad = np.radians(phi)
 
-    W_low = (W/t) * ((t/2)*np.cos(prad) + h*np.sin(prad))
-    W_high = (W/t) * ((t/2)*np.cos(prad) - h*np.sin(prad))
+    panel = panel_selector(["Parado na Superelevação", "Curva em Regime Permanente"], key="panel_banked")
 
-    c1, c2 = st.columns(2)
-    c1.metric("Rodas Baixas (Externas)", f"{W_low:.0f} N")
-    c2.metric("Rodas Altas (Internas)", f"{W_high:.0f} N")
+    if panel == "Parado na Superelevação":
+        W_low, W_high = banked_loads(vehicle.W, t, h, prad)
 
-    # Limites
-    lim_tomb = np.degrees(np.arctan(t/(2*h)))
-    lim_slide = np.degrees(np.arctan(mu_lat))
+        c1, c2 = st.columns(2)
+        c1.metric("Rodas Baixas (Externas)", f"{W_low:.0f} N")
+        c2.metric("Rodas Altas (Internas)", f"{W_high:.0f} N")
+
+        # Limites
+        lim_tomb, lim_slide = banked_limits(t, h, mu_lat)
     
-    # --- GRÁFICO DE ESTABILIDADE LATERAL ---
-    st.markdown("#### 📉 Gráfico: Estabilidade Lateral (Tombamento vs Deslizamento)")
-    st.caption("O veículo perde estabilidade quando a linha da roda interna (alta) cruza o zero (tombamento) ou quando excede o atrito.")
+        # --- GRÁFICO DE ESTABILIDADE LATERAL ---
+        st.markdown("#### 📉 Gráfico: Estabilidade Lateral (Tombamento vs Deslizamento)")
+        st.caption("O veículo perde estabilidade quando a linha da roda interna (alta) cruza o zero (tombamento) ou quando excede o atrito.")
     
-    angles_lat = np.linspace(0, min(lim_tomb + 10, 60), 50)
-    data_lat = []
-    for ang in angles_lat:
-        arad = np.radians(ang)
-        w_l = (W/t) * ((t/2)*np.cos(arad) + h*np.sin(arad))
-        w_h = (W/t) * ((t/2)*np.cos(arad) - h*np.sin(arad))
-        if w_h < 0: w_h = 0
-        data_lat.append({'Ângulo (°)': ang, 'Carga (N)': w_l, 'Roda': 'Externa (Baixa)'})
-        data_lat.append({'Ângulo (°)': ang, 'Carga (N)': w_h, 'Roda': 'Interna (Alta)'})
-
-    df_lat_chart = pd.DataFrame(data_lat)
-    chart_lat_lines = alt.Chart(df_lat_chart).mark_line().encode(
-        x='Ângulo (°)', y='Carga (N)', color='Roda'
-    )
+        df_lat_chart = banked_frame(vehicle.W, t, h, lim_tomb)
+        chart_lat_lines = alt.Chart(df_lat_chart).mark_line().encode(
+            x='Ângulo (°)', y='Carga (N)', color='Roda'
+        )
     
-    # Regra do limite atual
-    rule_lat = alt.Chart(pd.DataFrame({'x': [phi]})).mark_rule(color='red').encode(x='x')
+        # Regra do limite atual
+        rule_lat = alt.Chart(pd.DataFrame({'x': [phi]})).mark_rule(color='red').encode(x='x')
     
-    st.altair_chart(chart_lat_lines + rule_lat, use_container_width=True)
+        show_chart("banked_chart", chart_lat_lines + rule_lat, use_container_width=True)
     
-    l1, l2 = st.columns(2)
-    l1.metric("Limite Tombamento", f"{lim_tomb:.1f}°")
-    l2.metric("Limite Deslizamento", f"{lim_slide:.1f}°")
+        l1, l2 = st.columns(2)
+        l1.metric("Limite Tombamento", f"{lim_tomb:.1f}°")
+        l2.metric("Limite Deslizamento", f"{lim_slide:.1f}°")
 
-    if phi > lim_tomb: st.error("⚠️ TOMBAMENTO LATERAL!")
+        if phi > 0:
+            st.caption(f"Altura máxima do CG antes de tombar nesta superelevação: **{max_cg_height_bank(t, prad):.2f} m**")
+        if phi > lim_tomb: st.error("⚠️ TOMBAMENTO LATERAL!")
+
+    elif panel == "Curva em Regime Permanente":
+        st.subheader("Curva com Velocidade, Raio e Transferência Lateral de Carga")
+        st.latex(r"N = m(g\cos\phi + a_y\sin\phi) \qquad F_y = m(a_y\cos\phi - g\sin\phi) \qquad a_y = \frac{v^2}{R}")
+        st.caption("A pista sobe para o lado de fora da curva; 'ty' positivo desloca o CG para o lado de dentro.")
+
+        c1, c2 = st.columns(2)
+        v_sel = c1.slider("Velocidade (km/h)", 0.0, 200.0, 60.0, 1.0)
+        R_sel = c2.slider("Raio da Curva (m)", 5.0, 500.0, 50.0, 5.0)
+
+        loads = cornering_loads(vehicle.W, L, b, c, t, h, ty, v_sel / 3.6, R_sel, prad)
+        w1, w2, w3, w4 = st.columns(4)
+        w1.metric("Diant. Interna", f"{loads['front_in']:.0f} N")
+        w2.metric("Diant. Externa", f"{loads['front_out']:.0f} N")
+        w3.metric("Tras. Interna", f"{loads['rear_in']:.0f} N")
+        w4.metric("Tras. Externa", f"{loads['rear_out']:.0f} N")
+
+        ay_roll, ay_slide, ay_min = cornering_limits(t, h, ty, mu_lat, prad)
+        if tire is None:
+            v_lim = max_cornering_speed(t, h, ty, mu_lat, prad, R_sel) * 3.6
+        else:
+            ay_slide = tire_cornering_limit(vehicle.W, L, b, c, t, h, ty, tire, mu_lat, prad)
+            v_lim = np.sqrt(R_sel * np.minimum(ay_roll, ay_slide)) * 3.6
+        v_min = np.sqrt(R_sel * ay_min) * 3.6
+        m1, m2 = st.columns(2)
+        m1.metric("Velocidade Máxima neste Raio", f"{v_lim:.0f} km/h" if np.isfinite(v_lim) else "sem limite")
+        m2.metric("Velocidade Mínima neste Raio", f"{v_min:.0f} km/h")
+        if v_sel > v_lim:
+            st.error("⚠️ Acima do limite lateral (tombamento ou derrapagem)!")
+        elif v_sel < v_min:
+            st.error("⚠️ Abaixo da velocidade mínima: o veículo desliza ou tomba para dentro da pista inclinada!")
+
+        st.markdown("#### 🗺️ Mapa: Utilização do Limite Lateral (Raio x Velocidade)")
+        resolution = st.select_slider("Resolução da grade", [100, 250, 500, 1000], 500)
+        heatmap = cornering_heatmap(vehicle.W, L, b, c, t, h, ty, mu_lat, prad, 200.0, 5.0, 500.0, resolution, tire_spec)
+        with stage('heatmap_image', 'chart'):
+            st.image(heatmap, use_container_width=True)
 
 # ==============================================================================
 # MODO 4: FRENAGEM
@@ -389,44 +708,74 @@ elif analysis_mode == "🛑 Frenagem (Ideal e Eixo Simples)":
     theta_b = col_in2.slider("Inclinação Pista (°)", -20.0, 20.0, 0.0)
     trad = np.radians(theta_b)
 
-    dec_ideal = g * (mu_b * np.cos(trad) + np.sin(trad))
-    
-    # Travamento eixos
-    den_f = 1 - mu_b * (h/L)
-    den_r = 1 + mu_b * (h/L)
-    dec_front = (g * (mu_b * (c/L)) / den_f) + g*np.sin(trad) if den_f > 0 else 0
-    dec_rear = (g * (mu_b * (b/L)) / den_r) + g*np.sin(trad)
+    if tire is None:
+        dec_ideal, dec_front, dec_rear = braking_decelerations(L, b, c, h, mu_b, trad, vehicle.g)
+    else:
+        dec_ideal, dec_front, dec_rear = tire_braking_decelerations(vehicle.W, L, b, c, h, tire, mu_b, trad, vehicle.g)
 
     c1, c2, c3 = st.columns(3)
     c1.metric("4 Rodas (Ideal)", f"{dec_ideal:.2f} m/s²")
     c2.metric("Só Dianteiro", f"{dec_front:.2f} m/s²")
     c3.metric("Só Traseiro", f"{dec_rear:.2f} m/s²")
 
-    # --- GRÁFICO DE TRANSFERÊNCIA DE PESO NA FRENAGEM ---
-    st.markdown("#### 📉 Gráfico: Transferência de Peso Dinâmica")
-    st.caption("Conforme desaceleramos mais forte, o peso migra da traseira para a dianteira.")
-    
-    # Certifica que exista uma instância de Vehicle (é criada no modo de aceleração);
-    # caso contrário, cria uma instância mínima para uso nos demais modos.
-    try:
-        vehicle
-    except NameError:
-        vehicle = Vehicle(M, L, b, c, h, Af, Cd, fr, 1.225, 'FWD (Tração Dianteira)', 0.30, [1.0], 4.0, 0.90)
-    
-    decel_range = np.linspace(0, dec_ideal, 20)
-    data_brake = []
-    for d in decel_range:
-        # ax é negativo na frenagem para a fórmula dynamic_loads
-        wf_b, wr_b = vehicle.dynamic_loads(-d, trad)
-        data_brake.append({'Desaceleração (m/s²)': d, 'Carga (N)': wf_b, 'Eixo': 'Dianteiro'})
-        data_brake.append({'Desaceleração (m/s²)': d, 'Carga (N)': wr_b, 'Eixo': 'Traseiro'})
+    panel = panel_selector(["📉 Transferência de Peso", "⚖️ Distribuição de Frenagem"], key="panel_braking")
+
+    if panel == "📉 Transferência de Peso":
+        # --- GRÁFICO DE TRANSFERÊNCIA DE PESO NA FRENAGEM ---
+        st.markdown("#### 📉 Gráfico: Transferência de Peso Dinâmica")
+        st.caption("Conforme desaceleramos mais forte, o peso migra da traseira para a dianteira.")
     
-    df_brake = pd.DataFrame(data_brake)
-    chart_brake = alt.Chart(df_brake).mark_line().encode(
-        x='Desaceleração (m/s²)', y='Carga (N)', color='Eixo'
-    ).interactive()
+        # A transferência de carga não depende do powertrain: serve o veículo da barra lateral
+        df_brake = brake_frame(vehicle, dec_ideal, trad)
+        chart_brake = alt.Chart(df_brake).mark_line().encode(
+            x='Desaceleração (m/s²)', y='Carga (N)', color='Eixo'
+        ).interactive()
     
-    st.altair_chart(chart_brake, use_container_width=True)
+        show_chart("brake_chart", chart_brake, use_container_width=True)
+
+    elif panel == "⚖️ Distribuição de Frenagem":
+        # --- DISTRIBUIÇÃO DE FRENAGEM ---
+        st.markdown("#### ⚖️ Distribuição de Frenagem: Curva Ideal x Instalada")
+        st.caption("A curva instalada deve ficar abaixo da ideal: assim o eixo dianteiro trava primeiro (comportamento estável).")
+
+        p1, p2, p3, p4 = st.columns(4)
+        beta = p1.slider("Fração na Dianteira β", 0.50, 0.95, 0.70, 0.01)
+        two_stage = p2.checkbox("Válvula de 2 Estágios")
+        knee = p3.slider("Joelho (Fbf/W)", 0.05, 1.0, 0.30, 0.05, disabled=not two_stage)
+        slope = p4.slider("Inclinação Após o Joelho", 0.0, 1.0, 0.20, 0.05, disabled=not two_stage)
+        if not two_stage:
+            knee, slope = np.inf, None
+
+        if tire is None:
+            z_lock, rear_first, eff = brake_lock(L, b, c, h, mu_b, beta, knee, slope)
+        else:
+            z_lock, rear_first, eff = tire_brake_lock(vehicle.W, L, b, c, h, tire, mu_b, beta, knee, slope)
+        d1, d2, d3 = st.columns(3)
+        d1.metric("Trava Primeiro", "Traseiro" if rear_first else "Dianteiro")
+        d2.metric("Eficiência de Frenagem", f"{eff * 100:.1f} %")
+        d3.metric("Desac. no Travamento", f"{vehicle.g * (z_lock * np.cos(trad) + np.sin(trad)):.2f} m/s²")
+        if rear_first:
+            st.warning("⚠️ O eixo traseiro trava primeiro neste atrito: risco de instabilidade direcional.")
+
+        df_balance = brake_balance_frame(vehicle.W, L, b, c, h, mu_b, beta, knee, slope)
+        show_chart("brake_balance_chart", alt.Chart(df_balance).mark_line().encode(
+            x='Fbf (N)', y='Fbr (N)', color='Curva', tooltip=['Curva', 'Fbf (N)', 'Fbr (N)']
+        ).interactive(), use_container_width=True)
+
+        if st.button("🎯 Otimizar distribuição (μ 0.2–1.0, rampa ±20°, carga 0–400 kg)"):
+            fixed, staged = brake_bias_optimum(M, L, b, h)
+            st.caption("Candidatos que travam o traseiro primeiro em parte do envelope só são escolhidos se nenhum evitar isso.")
+            o1, o2 = st.columns(2)
+            o1.metric("Melhor β Fixo", f"{fixed['beta']:.3f}", f"pior eficiência {fixed['efficiency'] * 100:.1f} %")
+            o2.metric("Melhor 2 Estágios (β / joelho / inclinação)",
+                      f"{staged['beta']:.2f} / {staged['knee']:.2f} / {staged['slope']:.2f}",
+                      f"pior eficiência {staged['efficiency'] * 100:.1f} %")
+            o1.metric("Traseiro Trava Primeiro (β fixo)", f"{fixed['rear_first_share'] * 100:.0f} % do envelope")
+            o2.metric("Traseiro Trava Primeiro (2 estágios)", f"{staged['rear_first_share'] * 100:.0f} % do envelope")
+            for label, res in (("β fixo", fixed), ("2 estágios", staged)):
+                if res['rear_first_share'] > 0:
+                    st.warning(f"⚠️ Com o melhor {label}, o eixo traseiro trava primeiro em "
+                               f"{res['rear_first_share'] * 100:.0f} % do envelope: risco de instabilidade direcional.")
 
 # ==============================================================================
 # MODO 5: TRAILER
@@ -438,7 +787,7 @@ elif analysis_mode == "🚛 Veículo com Trailer (Inclinado)":
     col1, col2 = st.columns(2)
     with col1:
         Mt = st.number_input("Massa Trailer (kg)", 500.0)
-        Wt = Mt * g
+        Wt = Mt * vehicle.g
         Lt = st.number_input("Comp. Trailer (m)", 2.0)
         lt_cg = st.number_input("CG Trailer ao Eixo (m)", 0.2)
     with col2:
@@ -446,32 +795,21 @@ elif analysis_mode == "🚛 Veículo com Trailer (Inclinado)":
         theta_t = st.slider("Inclinação Rampa (°)", 0.0, 20.0, 5.0)
         trad = np.radians(theta_t)
 
-    W_engate = (Wt * np.cos(trad)) * (lt_cg / Lt) 
-    
-    # Cargas originais (sem trailer) na rampa
-    Wf_car = (W/L) * (c*np.cos(trad) - h*np.sin(trad))
-    Wr_car = (W/L) * (b*np.cos(trad) + h*np.sin(trad))
-
-    # Deltas
-    dWf = - (W_engate * lh) / L
-    dWr = W_engate * (1 + lh/L)
-
-    Wf_final = Wf_car + dWf
-    Wr_final = Wr_car + dWr
+    W_engate, Wf_car, Wr_car, Wf_final, Wr_final = trailer_loads(vehicle.W, L, b, c, h, Wt, Lt, lt_cg, lh, trad)
     
-    st.metric("Carga Vertical Engate", f"{W_engate:.1f} N")
+    e1, e2 = st.columns(2)
+    e1.metric("Carga Vertical Engate", f"{W_engate:.1f} N")
+    e2.metric("Massa Máx. Trailer (Wf = 0)", f"{max_trailer_mass(vehicle.W, L, b, c, h, Lt, lt_cg, lh, trad, vehicle.g):.0f} kg")
 
     # --- GRÁFICO COMPARATIVO COM/SEM TRAILER ---
     st.markdown("#### 📊 Comparativo: Efeito do Trailer nos Eixos")
     st.caption("Note o efeito 'gangorra': O trailer adiciona peso atrás, aliviando a frente e sobrecarregando a traseira.")
 
-    data_trailer = [
-        {'Eixo': 'Dianteiro', 'Condição': 'Sem Trailer', 'Carga (N)': Wf_car},
-        {'Eixo': 'Dianteiro', 'Condição': 'Com Trailer', 'Carga (N)': Wf_final},
-        {'Eixo': 'Traseiro', 'Condição': 'Sem Trailer', 'Carga (N)': Wr_car},
-        {'Eixo': 'Traseiro', 'Condição': 'Com Trailer', 'Carga (N)': Wr_final},
-    ]
-    df_trailer = pd.DataFrame(data_trailer)
+    df_trailer = pd.DataFrame({
+        'Eixo': ['Dianteiro', 'Dianteiro', 'Traseiro', 'Traseiro'],
+        'Condição': ['Sem Trailer', 'Com Trailer'] * 2,
+        'Carga (N)': [Wf_car, Wf_final, Wr_car, Wr_final],
+    })
     
     chart_trailer = alt.Chart(df_trailer).mark_bar().encode(
         x=alt.X('Eixo', axis=None),
@@ -481,9 +819,111 @@ elif analysis_mode == "🚛 Veículo com Trailer (Inclinado)":
         tooltip=['Condição', 'Carga (N)']
     ).properties(width=150)
     
-    st.altair_chart(chart_trailer, use_container_width=False)
+    show_chart("trailer_chart", chart_trailer, use_container_width=False)
     
     if Wf_final <= 0: st.error("🚨 PERIGO: Veículo Empinando!")
 
+    # --- CONJUNTO EM ACELERAÇÃO / FRENAGEM ---
+    st.markdown("#### 🚦 Conjunto em Aceleração e Frenagem")
+    st.caption("Equilíbrio das duas unidades com engate articulado, incluindo a inércia: cargas em todos os eixos e no engate em função da aceleração (negativa = frenagem).")
+    a1, a2, a3, a4 = st.columns(4)
+    ax_t = a1.slider("Aceleração (m/s²)", -8.0, 3.0, -4.0, 0.5)
+    h_t = a2.number_input("Altura CG Trailer (m)", 0.6)
+    z_hitch = a3.number_input("Altura do Engate (m)", 0.45)
+    trailer_brakes = a4.checkbox("Trailer com freio", value=False)
+
+    df_art = articulated_frame(M, L, b, h, Mt, Lt, lt_cg, lh, h_t, z_hitch, trad, trailer_brakes)
+    point = df_art[np.isclose(df_art['ax (m/s²)'], ax_t)].set_index('Eixo')['Carga (N)']
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric("Carro Dianteiro", f"{point['Carro Dianteiro']:.0f} N")
+    m2.metric("Carro Traseiro", f"{point['Carro Traseiro']:.0f} N")
+    m3.metric("Eixo Trailer", f"{point['Reboque']:.0f} N")
+    m4.metric("Engate Vertical", f"{point['Engate (vertical)']:.0f} N")
+    m5.metric("Engate Longitudinal", f"{point['Engate (longitudinal)']:.0f} N")
+
+    rule_art = alt.Chart(pd.DataFrame({'x': [ax_t]})).mark_rule(color='red', strokeDash=[5, 5]).encode(x='x')
+    show_chart("articulated_chart", alt.Chart(df_art).mark_line().encode(
+        x='ax (m/s²)', y='Carga (N)', color='Eixo', tooltip=['Eixo', 'ax (m/s²)', 'Carga (N)']
+    ).interactive() + rule_art, use_container_width=True)
+
+# ==============================================================================
+# MODO 6: OTIMIZAÇÃO DE GEOMETRIA
+# ==============================================================================
+elif analysis_mode == "🧭 Otimização de Geometria (Pareto)":
+    st.header("🧭 Exploração do Espaço de Projeto")
+    st.caption("NSGA-II vetorizado sobre a geometria: maximiza rampa de arrancada, eficiência de frenagem e ângulo de tombamento, minimiza 0–100 e potência de arrasto a 120 km/h. "
+               "Restrições: 50–65% da carga estática no eixo dianteiro e eixo traseiro nunca travando primeiro (μ de 0,3 a 1,0). "
+               "A área frontal escala com a bitola e a altura do CG; o powertrain é o padrão do modo de aceleração.")
+
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("### 🧭 Otimizador")
+        drive_type = st.selectbox("Tração", DRIVE_TYPES)
+        mu_opt = st.slider("Coef. Atrito (μ)", 0.3, 1.2, 0.85, 0.05)
+        pop_size = st.select_slider("População", [200, 500, 1000, 2000], 500)
+        generations = st.slider("Gerações", 10, 100, 40, 5)
+        with st.expander("Faixas das Variáveis"):
+            bounds = tuple((k, st.slider(DESIGN_LABELS[k], float(lo - (hi - lo) / 2), float(hi + (hi - lo) / 2), (float(lo), float(hi))))
+                           for k, (lo, hi) in DESIGN_BOUNDS.items())
+
+    base = vehicle.replace(drive_type=drive_type)
+    engine_opt = ('catalogo', 160.0, 2000.0, 116.0, 5500.0, 6500.0)
+    df_front = pareto_front(base, engine_opt, bounds, pop_size, generations, mu_opt, t)
+
+    # Veículo atual (barra lateral) no mesmo espaço de objetivos, para comparação
+    with stage('current_design'):
+        current, _ = evaluate_designs(base, make_engine(engine_opt), {
+            'L': np.array([L]), 'b_frac': np.array([b / L]), 'h': np.array([h]), 't': np.array([t]),
+            'Cd': np.array([Cd]), 'final_drive': np.array([4.0]), 'beta': np.array([0.7]),
+        }, mu=mu_opt, t_ref=t)
+    df_current = pd.DataFrame({OBJECTIVE_LABELS[k]: v for k, v in current.items()})
+
+    st.metric("Projetos no Front de Pareto", f"{len(df_front)}")
+    labels = list(OBJECTIVE_LABELS.values())
+    o1, o2, o3 = st.columns(3)
+    x_obj = o1.selectbox("Eixo X", labels, index=3)
+    y_obj = o2.selectbox("Eixo Y", labels, index=0)
+    color_obj = o3.selectbox("Cor", labels, index=4)
+
+    points = alt.Chart(df_front).mark_circle(size=40).encode(
+        x=alt.X(x_obj, scale=alt.Scale(zero=False)), y=alt.Y(y_obj, scale=alt.Scale(zero=False)),
+        color=alt.Color(color_obj, scale=alt.Scale(scheme='viridis')),
+        tooltip=list(df_front.columns),
+    )
+    marker = alt.Chart(df_current).mark_point(shape='diamond', size=150, color='red', filled=True).encode(
+        x=x_obj, y=y_obj, tooltip=labels)
+    show_chart("pareto_chart", (points + marker).interactive(), use_container_width=True)
+    st.caption("Losango vermelho: veículo atual da barra lateral (Cd, b, h, t, L atuais; diferencial 4,0; β = 0,70).")
+    with st.expander("Tabela do Front"):
+        st.dataframe(df_front.sort_values(x_obj).round(3), use_container_width=True)
+
 st.markdown("---")
+with st.expander("📦 Estatísticas de Cache"):
+    st.dataframe(pd.DataFrame(cache_stats()).T, use_container_width=True)
+
+# Fecha o rerun antes do painel de desempenho: o próprio painel não entra na medição
+profile = end_rerun()
+if show_profile:
+    st.markdown("### 🩺 Desempenho")
+    by_kind = profile.by_kind()
+    k = st.columns(len(by_kind) + 1)
+    k[0].metric("Rerun", f"{profile.elapsed * 1000:.1f} ms")
+    for col, (kind, seconds) in zip(k[1:], by_kind.items()):
+        col.metric(kind, f"{seconds * 1000:.1f} ms")
+
+    df_profile = pd.DataFrame(profile.records, columns=['Etapa', 'Tipo', 'Total (ms)', 'Próprio (ms)'])
+    df_profile[['Total (ms)', 'Próprio (ms)']] *= 1000
+    st.altair_chart(alt.Chart(df_profile).mark_bar().encode(
+        x=alt.X('sum(Próprio (ms))', title='Tempo próprio (ms)'), y=alt.Y('Etapa', sort='-x'), color='Tipo',
+        tooltip=['Etapa', 'Tipo', 'sum(Total (ms))', 'sum(Próprio (ms))'],
+    ), use_container_width=True)
+    st.dataframe(df_profile.round(3), use_container_width=True)
+
+    with st.expander("Contadores acumulados (processo)"):
+        df_stats = pd.DataFrame(stage_stats())
+        if len(df_stats):
+            df_stats['mean_ms'] = df_stats['total_s'] / df_stats['calls'] * 1000
+            st.dataframe(df_stats.sort_values('self_s', ascending=False).round(5), use_container_width=True)
+    with st.expander("Exposição Prometheus"):
+        st.code(prometheus_text(), language="text")
 st.caption("Simulador Atividade 02 - Engenharia Mecatrônica")
\ No newline at end of file
@@ -0,0 +1,91 @@
+import math
+
+# Implementações escalares de referência, copiadas das fórmulas originais do app.py
+# (laço ponto a ponto). Servem só para conferir que as versões vetorizadas de
+# dinamica continuam dando os mesmos números.
+G = 9.81
+
+def dynamic_loads(M, L, b, c, h, ax, theta_rad):
+    W = M * G
+    Wf_stat = (c / L) * W * math.cos(theta_rad) - (h / L) * W * math.sin(theta_rad)
+    Wr_stat = (b / L) * W * math.cos(theta_rad) + (h / L) * W * math.sin(theta_rad)
+    Delta_W_inertia = (h / L) * (ax * M)
+    return Wf_stat - Delta_W_inertia, Wr_stat + Delta_W_inertia
+
+def max_tractive_force(drive_type, Wf, Wr, mu):
+    if drive_type == 'FWD (Tração Dianteira)':
+        Fmax = mu * Wf
+    elif drive_type == 'RWD (Tração Traseira)':
+        Fmax = mu * Wr
+    elif drive_type == 'AWD (Tração Integral)':
+        Fmax = mu * (Wf + Wr)
+    else:
+        Fmax = 0
+    return Fmax
+
+def traction_curve(rpm, torque_motor, ratio, tire_radius, final_drive, eta_d, F_limit):
+    v_kmh = ((rpm * 2 * math.pi / 60) * tire_radius / (ratio * final_drive)) * 3.6
+    ft = (torque_motor * ratio * final_drive * eta_d) / tire_radius
+    return v_kmh, min(ft, F_limit)
+
+def parked_grade_loads(W, L, b, c, h, trad):
+    Wf_inc = (W/L) * (c*math.cos(trad) - h*math.sin(trad))
+    Wr_inc = (W/L) * (b*math.cos(trad) + h*math.sin(trad))
+    return Wf_inc, Wr_inc
+
+def banked_loads(W, t, h, prad):
+    W_low = (W/t) * ((t/2)*math.cos(prad) + h*math.sin(prad))
+    W_high = (W/t) * ((t/2)*math.cos(prad) - h*math.sin(prad))
+    return W_low, W_high
+
+def braking_decelerations(L, b, c, h, mu_b, trad):
+    g = G
+    dec_ideal = g * (mu_b * math.cos(trad) + math.sin(trad))
+    den_f = 1 - mu_b * (h/L)
+    den_r = 1 + mu_b * (h/L)
+    dec_front = (g * (mu_b * (c/L)) / den_f) + g*math.sin(trad) if den_f > 0 else 0
+    dec_rear = (g * (mu_b * (b/L)) / den_r) + g*math.sin(trad)
+    return dec_ideal, dec_front, dec_rear
+
+def trailer_loads(W, L, b, c, h, Wt, Lt, lt_cg, lh, trad):
+    W_engate = (Wt * math.cos(trad)) * (lt_cg / Lt)
+    Wf_car = (W/L) * (c*math.cos(trad) - h*math.sin(trad))
+    Wr_car = (W/L) * (b*math.cos(trad) + h*math.sin(trad))
+    dWf = - (W_engate * lh) / L
+    dWr = W_engate * (1 + lh/L)
+    return W_engate, Wf_car, Wr_car, Wf_car + dWf, Wr_car + dWr
+
+def cornering_utilization(t, h, ty, mu, v, R, phi):
+    # Sem equivalente no app original: utilização do limite lateral, limite superior
+    # que vale (0 = tombamento, 1 = derrapagem) e ay_min num ponto (v, R, ϕ)
+    g = G
+    ay = v**2 / R
+    tan_p = math.tan(phi)
+    arm_in, arm_out = t/2 + ty, t/2 - ty
+    den = h - arm_in * tan_p
+    ay_roll = g * (arm_in + h * tan_p) / den if den > 0 else math.inf
+    den = 1 - mu * tan_p
+    ay_slide = g * (tan_p + mu) / den if den > 0 else math.inf
+    ay_min = max(g * (h * tan_p - arm_out) / (h + arm_out * tan_p), g * (tan_p - mu) / (1 + mu * tan_p), 0.0)
+    util = ay / min(ay_roll, ay_slide)
+    if ay_min > 0:
+        util = max(util, ay_min / ay)
+    return util, float(ay_slide < ay_roll), ay_min
+
+def magic_formula_forces(Fz, kappa, alpha, mu, tire):
+    # Sem equivalente no app original: forma fechada do MagicFormulaTire (escorregamento
+    # combinado normalizado), com senos e arcotangentes ponto a ponto, sem tabelas
+    Fz0 = tire.Fz0
+    dfz = (Fz - Fz0) / Fz0
+    D = mu * max(1 + tire.load_sensitivity * dfz, 0.0) * Fz
+    if D <= 0:
+        return 0.0, 0.0
+    Kx = tire.kx * Fz * math.exp(tire.kx_load * dfz)
+    Ky = tire.ky * Fz0 * math.sin(2 * math.atan(Fz / (tire.ky_load * Fz0))) / math.sin(2 * math.atan(1 / tire.ky_load))
+    rx = Kx / (tire.Cx * D) * kappa / tire.u_px
+    ry = Ky / (tire.Cy * D) * alpha / tire.u_py
+    rho = math.hypot(rx, ry)
+    if rho == 0:
+        return 0.0, 0.0
+    f = lambda u, C, E: math.sin(C * math.atan(u - E * (u - math.atan(u))))
+    return D * f(rho * tire.u_px, tire.Cx, tire.Ex) * rx / rho, D * f(rho * tire.u_py, tire.Cy, tire.Ey) * ry / rho
@@ -0,0 +1,358 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+import dinamica
+from dinamica import (
+    DRIVE_TYPES, Vehicle, torque_curve, traction_curves, simulate_acceleration, MagicFormulaTire, BrushTire,
+    parked_grade_loads, banked_loads, braking_decelerations, trailer_loads, cornering_map,
+)
+from . import reference as ref
+
+# Benchmarks dos kernels de dinâmica: tempo (mín/mediana), pico de memória (tracemalloc)
+# e equivalência numérica contra as fórmulas escalares originais (benchmarks/reference.py)
+# numa amostra de pontos. Resultados em JSON; com --compare, tempos acima do limiar em
+# relação a um resultado anterior são marcados como regressão (código de saída 1).
+#
+#   python -m benchmarks                          # tamanhos 1, 1e3, 1e6
+#   python -m benchmarks --sizes 1,1e3,1e6,1e8    # inclui 1e8 (~10 GB de RAM)
+#   python -m benchmarks --compare benchmarks/results/baseline.json
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+ONIX = dict(M=1117.0, L=2.55, b=1.10, c=1.45, h=0.55, t=1.50)
+
+def onix(drive_type=DRIVE_TYPES[0], gear_ratios=(3.5, 2.1, 1.4, 1.0, 0.8)):
+    p = ONIX
+    return Vehicle(p['M'], p['L'], p['b'], p['c'], p['h'], 2.1, 0.32, 0.015, 1.225,
+                   drive_type, 0.30, list(gear_ratios), 4.0, 0.90)
+
+def _at(x, i):
+    return np.ravel(x)[i] if np.ndim(x) else x
+
+def _inputs(n, rng, **ranges):
+    # Tamanho 1 = chamada escalar (floats Python), como no app
+    out = {}
+    for name, (low, high) in ranges.items():
+        values = rng.uniform(low, high, n)
+        out[name] = float(values[0]) if n == 1 else values
+    return out
+
+# --- KERNELS ---
+# Cada kernel: setup(n, rng) -> entradas; run(entradas) -> tupla de saídas;
+# reference(entradas, i) -> valores esperados no índice achatado i de cada saída;
+# checks() -> lista de casos-limite que falharam (entradas fora da amostra aleatória,
+# conferidas uma vez por execução).
+
+class Kernel:
+    # rtol: tolerância própria do kernel (ex.: tabelas interpoladas); None = a da linha de comando
+    def __init__(self, name, setup, run, reference=None, max_size=None, rtol=None, checks=None):
+        self.name, self.setup, self.run, self.reference, self.max_size = name, setup, run, reference, max_size
+        self.rtol, self.checks = rtol, checks
+
+def _dynamic_loads():
+    v = onix()
+    p = ONIX
+    return Kernel(
+        'dynamic_loads',
+        lambda n, rng: _inputs(n, rng, ax=(-10, 5), theta=(-0.5, 0.5)),
+        lambda x: v.dynamic_loads(x['ax'], x['theta']),
+        lambda x, i: ref.dynamic_loads(p['M'], p['L'], p['b'], p['c'], p['h'], _at(x['ax'], i), _at(x['theta'], i)),
+    )
+
+def _max_tractive_force():
+    v = onix()
+
+    def setup(n, rng):
+        x = _inputs(n, rng, Wf=(0, 8000), Wr=(0, 8000), mu=(0.1, 1.2))
+        x['drive'] = int(rng.integers(0, 3)) if n == 1 else rng.integers(0, 3, n)
+        return x
+
+    return Kernel(
+        'max_tractive_force', setup,
+        lambda x: (v.max_tractive_force(x['Wf'], x['Wr'], x['mu'], x['drive']),),
+        lambda x, i: (ref.max_tractive_force(DRIVE_TYPES[_at(x['drive'], i)], _at(x['Wf'], i), _at(x['Wr'], i), _at(x['mu'], i)),),
+    )
+
+def _traction_curves():
+    v = onix()
+    rpm_pts, torque_pts = torque_curve(160.0, 2000.0, 5500.0, 6500.0)
+    n_gears = len(v.gear_ratios)
+    F_limit = 5000.0
+
+    def setup(n, rng):
+        # n pontos no total: n // n_gears rotações por marcha
+        rpm = np.linspace(800, 6500, max(n // n_gears, 1))
+        return {'rpm': rpm, 'torque': np.interp(rpm, rpm_pts, torque_pts)}
+
+    def reference(x, i):
+        gear, k = divmod(i, x['rpm'].size)
+        return ref.traction_curve(x['rpm'][k], x['torque'][k], v.gear_ratios[gear], v.tire_radius,
+                                  v.final_drive, v.eta_d, F_limit)
+
+    return Kernel('traction_curves', setup,
+                  lambda x: traction_curves(v, x['rpm'], x['torque'], F_limit), reference)
+
+def _parked_grade_loads():
+    p = ONIX
+    W = p['M'] * ref.G
+    return Kernel(
+        'parked_grade_loads',
+        lambda n, rng: _inputs(n, rng, theta=(0, 1.2)),
+        lambda x: parked_grade_loads(W, p['L'], p['b'], p['c'], p['h'], x['theta']),
+        lambda x, i: ref.parked_grade_loads(W, p['L'], p['b'], p['c'], p['h'], _at(x['theta'], i)),
+    )
+
+def _banked_loads():
+    p = ONIX
+    W = p['M'] * ref.G
+    return Kernel(
+        'banked_loads',
+        lambda n, rng: _inputs(n, rng, phi=(0, 1.0)),
+        lambda x: banked_loads(W, p['t'], p['h'], x['phi']),
+        lambda x, i: ref.banked_loads(W, p['t'], p['h'], _at(x['phi'], i)),
+    )
+
+def _braking_decelerations():
+    p = ONIX
+    return Kernel(
+        'braking_decelerations',
+        lambda n, rng: _inputs(n, rng, mu_b=(0.2, 1.0), theta=(-0.35, 0.35)),
+        lambda x: braking_decelerations(p['L'], p['b'], p['c'], p['h'], x['mu_b'], x['theta']),
+        lambda x, i: ref.braking_decelerations(p['L'], p['b'], p['c'], p['h'], _at(x['mu_b'], i), _at(x['theta'], i)),
+    )
+
+def _trailer_loads():
+    p = ONIX
+    W = p['M'] * ref.G
+    return Kernel(
+        'trailer_loads',
+        lambda n, rng: _inputs(n, rng, Wt=(0, 15000), theta=(0, 0.35)),
+        lambda x: trailer_loads(W, p['L'], p['b'], p['c'], p['h'], x['Wt'], 2.0, 0.2, 0.8, x['theta']),
+        lambda x, i: ref.trailer_loads(W, p['L'], p['b'], p['c'], p['h'], _at(x['Wt'], i), 2.0, 0.2, 0.8, _at(x['theta'], i)),
+    )
+
+def _cornering_map():
+    # Grade (v, R, ϕ) com eixo próprio para cada variável; μ baixo para que ay_min > 0
+    # numa parte da grade (pista inclinada onde o carro desliza para dentro)
+    p = ONIX
+    W = p['M'] * ref.G
+    mu = 0.3
+
+    def setup(n, rng):
+        k = max(int(round(n ** (1 / 3))), 1)
+        return {'v': rng.uniform(0.5, 40, k)[:, None, None], 'R': rng.uniform(5, 500, k)[None, :, None],
+                'phi': rng.uniform(0, 0.6, k)[None, None, :], 'k': k}
+
+    def reference(x, i):
+        iv, iR, ip = np.unravel_index(i, (x['k'],) * 3)
+        return ref.cornering_utilization(p['t'], p['h'], 0.0, mu, float(x['v'][iv, 0, 0]),
+                                         float(x['R'][0, iR, 0]), float(x['phi'][0, 0, ip]))
+
+    def run(x):
+        m = cornering_map(W, p['L'], p['b'], p['c'], p['t'], p['h'], 0.0, mu, x['v'], x['R'], x['phi'])
+        # ay_min vem de ϕ só, mas tem de sair no formato da grade (índice achatado comum)
+        return m['utilization'], m['mode'], m['ay_min']
+
+    return Kernel('cornering_map', setup, run, reference)
+
+def _simulate_acceleration():
+    rpm_pts, torque_pts = torque_curve(160.0, 2000.0, 5500.0, 6500.0)
+
+    def setup(n, rng):
+        x = _inputs(n, rng, M=(900, 1600), h=(0.45, 0.65))
+        p = ONIX
+        x['vehicle'] = Vehicle(x['M'], p['L'], p['b'], p['c'], x['h'], 2.1, 0.32, 0.015, 1.225,
+                               DRIVE_TYPES[0], 0.30, [3.5, 2.1, 1.4, 1.0, 0.8], 4.0, 0.90)
+        return x
+
+    # Sem referência escalar (não existia no app original): só tempo e memória
+    return Kernel('simulate_acceleration', setup,
+                  lambda x: (simulate_acceleration(x['vehicle'], 0.85, rpm_pts, torque_pts, dt=0.02)['t_0_100'],),
+                  max_size=100_000)
+
+def _tire_forces():
+    # Estados de roda (Fz, kappa, alpha, mu) com escorregamento combinado; meta: 1e7 estados/s
+    tire = MagicFormulaTire()
+
+    def setup(n, rng):
+        return _inputs(n, rng, Fz=(0, 9000), kappa=(-1, 1), alpha=(-0.5, 0.5), mu=(0.2, 1.2))
+
+    def checks():
+        # Entrada não finita -> NaN; mu <= 0 ou minúsculo (rho estoura) -> 0; nunca exceção
+        nan = np.nan
+        cases = [
+            ((nan, 0.1, 0.0, 1.0), (nan, nan)), ((3000, nan, 0.0, 1.0), (nan, nan)),
+            ((3000, 0.1, nan, 1.0), (nan, nan)), ((3000, 0.1, 0.0, nan), (nan, nan)),
+            ((np.inf, 0.1, 0.0, 1.0), (nan, nan)), ((3000, np.inf, 0.0, 1.0), (nan, nan)),
+            ((3000, 0.1, 0.05, 0.0), (0.0, 0.0)), ((3000, 0.1, 0.05, -0.5), (0.0, 0.0)),
+            ((3000, 0.1, 0.05, 1e-300), (0.0, 0.0)), ((3000, 0.1, 0.05, 1e-320), (0.0, 0.0)),
+            ((-500, 0.1, 0.05, 1.0), (0.0, 0.0)), ((5e4, 0.1, 0.05, 1.0), None),
+        ]
+        failed = []
+        for model in (tire, BrushTire()):
+            for args, expected in cases:
+                try:
+                    got = [float(f) for f in model.forces(*args)]
+                except Exception as exc:
+                    failed.append(f"{type(model).__name__}.forces{args}: {type(exc).__name__}: {exc}")
+                    continue
+                if expected is None:
+                    ok = all(np.isfinite(got))
+                else:
+                    ok = all(np.isnan(e) and np.isnan(g) or g == e for g, e in zip(got, expected))
+                if not ok:
+                    failed.append(f"{type(model).__name__}.forces{args} = {got}, esperado {expected or 'finito'}")
+            # Pico e rigidez coerentes com forces() acima de Fz_max
+            Fz = 2.5 * model.Fz_max
+            peak = model.forces(Fz, np.linspace(0, 1, 20001))[0].max()
+            if not np.isclose(peak, model.max_force(Fz), rtol=1e-3):
+                failed.append(f"{type(model).__name__}: max_force({Fz:g}) = {model.max_force(Fz):.1f}, pico de forces() = {peak:.1f}")
+        return failed
+
+    return Kernel(
+        'tire_forces', setup,
+        lambda x: tire.forces(x['Fz'], x['kappa'], x['alpha'], x['mu']),
+        lambda x, i: ref.magic_formula_forces(_at(x['Fz'], i), _at(x['kappa'], i), _at(x['alpha'], i), _at(x['mu'], i), tire),
+        rtol=1e-5, checks=checks,
+    )
+
+KERNELS = [
+    _dynamic_loads, _max_tractive_force, _traction_curves, _parked_grade_loads,
+    _banked_loads, _braking_decelerations, _trailer_loads, _cornering_map, _simulate_acceleration,
+    _tire_forces,
+]
+
+# --- EXECUÇÃO ---
+def max_rel_error(kernel, inputs, outputs, rng, n_check):
+    outputs = [np.ravel(o) for o in outputs]
+    size = outputs[0].size
+    idx = rng.choice(size, min(size, n_check), replace=False)
+    worst = 0.0
+    for i in idx:
+        expected = kernel.reference(inputs, int(i))
+        for out, exp in zip(outputs, expected):
+            got = float(out[i])
+            if np.isnan(got) or np.isnan(exp):
+                # NaN só bate com NaN (max() ignoraria a comparação com NaN)
+                worst = max(worst, 0.0 if np.isnan(got) and np.isnan(exp) else np.inf)
+                continue
+            worst = max(worst, abs(got - exp) / max(abs(exp), 1.0))
+    return worst
+
+def bench(kernel, n, min_time=0.5, max_repeats=50, n_check=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    inputs = kernel.setup(n, rng)
+
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_repeats and (not times or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        outputs = kernel.run(inputs)
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    kernel.run(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'kernel': kernel.name, 'size': n, 'repeats': len(times),
+        'min_s': min(times), 'median_s': float(np.median(times)), 'peak_mb': peak / 2**20,
+    }
+    if kernel.reference is not None:
+        result['max_rel_err'] = max_rel_error(kernel, inputs, outputs, rng, n_check)
+        if kernel.rtol is not None:
+            result['rtol'] = kernel.rtol
+    return result
+
+def source_revision():
+    # Commit do código medido (git rev-parse HEAD) e se dinamica/benchmarks têm alterações
+    # não commitadas; None fora de um repositório git
+    root = Path(dinamica.__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--', 'dinamica', 'benchmarks'], cwd=root,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {'commit': commit, 'dirty': bool(status.strip())}
+
+def compare(results, baseline, threshold):
+    # Lista de regressões: tempo mínimo acima de (1 + threshold) x o mínimo de referência
+    # (o mínimo é bem menos ruidoso que a mediana em tempos de microssegundos)
+    base = {(r['kernel'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        b = base.get((r['kernel'], r['size']))
+        if b is None:
+            continue
+        ratio = r['min_s'] / b['min_s']
+        r['ratio'] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(r)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmarks dos kernels de dinamica.")
+    parser.add_argument('--sizes', default='1,1e3,1e6', help="tamanhos separados por vírgula (padrão: %(default)s)")
+    parser.add_argument('--kernels', default='', help="subconjunto de kernels, separados por vírgula")
+    parser.add_argument('--output', type=Path, help="arquivo JSON de saída (padrão: benchmarks/results/<data>.json)")
+    parser.add_argument('--compare', type=Path, help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument('--threshold', type=float, default=0.25, help="regressão tolerada no tempo mínimo (padrão: %(default)s)")
+    parser.add_argument('--rtol', type=float, default=1e-9, help="erro relativo máximo contra a referência (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes.split(',')]
+    wanted = set(filter(None, args.kernels.split(',')))
+    kernels = [make() for make in KERNELS]
+    kernels = [k for k in kernels if not wanted or k.name in wanted]
+
+    results = []
+    for kernel in kernels:
+        for n in sizes:
+            if kernel.max_size is not None and n > kernel.max_size:
+                continue
+            r = bench(kernel, n)
+            results.append(r)
+            err = r.get('max_rel_err')
+            print(f"{kernel.name:24s} n={n:<11d} mediana={r['median_s'] * 1e3:10.3f} ms  "
+                  f"pico={r['peak_mb']:9.1f} MB  erro={'—' if err is None else f'{err:.1e}'}")
+
+    failed = [r for r in results if r.get('max_rel_err', 0.0) > r.get('rtol', args.rtol)]
+    for r in failed:
+        print(f"DIVERGÊNCIA: {r['kernel']} n={r['size']} erro relativo {r['max_rel_err']:.2e} > {r.get('rtol', args.rtol):g}")
+    for kernel in kernels:
+        for message in kernel.checks() if kernel.checks is not None else ():
+            print(f"CASO-LIMITE: {kernel.name}: {message}")
+            failed.append(message)
+
+    regressions = []
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        rev = baseline.get('meta', {}).get('revision')
+        if rev:
+            print(f"Comparando com {rev['commit'][:12]}{' (com alterações)' if rev['dirty'] else ''}")
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSÃO: {r['kernel']} n={r['size']} {r['ratio']:.2f}x mais lento")
+
+    output = args.output or RESULTS_DIR / time.strftime('%Y%m%d-%H%M%S.json')
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'meta': {
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'revision': source_revision(), 'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'threshold': args.threshold,
+        },
+        'results': results,
+    }, indent=2))
+    print(f"Resultados em {output}")
+    return 1 if failed or regressions else 0
@@ -0,0 +1,31 @@
+# Modelo de dinâmica veicular (Jazar) independente da interface Streamlit.
+# Depende apenas de NumPy.
+#
+# Módulos pesados da biblioteca padrão (concurrent.futures, multiprocessing, logging,
+# http.server) são importados dentro das funções que os usam, não no topo dos módulos:
+# dinamica é importado por workers em lote, onde o custo de importação conta.
+from .vehicle import G, DRIVE_TYPES, DRIVE_SPLIT, drive_index, Vehicle, VehicleBatch, batch_dtype
+from .formulas import (
+    parked_level_loads, parked_grade_loads, grade_rollover_angle,
+    banked_loads, banked_limits, braking_decelerations, trailer_loads,
+)
+from .powertrain import torque_curve, interp_rows, wheel_speed_to_rpm, engine_tractive_force, traction_curves, interp_table
+from .simulation import traction_limit, simulate_acceleration
+from .cache import LRUCache, memoize, cache_stats, clear_caches
+from .montecarlo import RunningStats, monte_carlo, monte_carlo_iter
+from .solvers import bisect, max_launch_grade, max_trailer_mass, max_cg_height_grade, max_cg_height_bank
+from .cornering import cornering_loads, cornering_limits, max_cornering_speed, cornering_map, tire_cornering_limit
+from .braking import (
+    ideal_braking_curve, installed_braking_curve, lock_lines, brake_lock, payload_params, optimize_brake_bias,
+    tire_braking_decelerations, tire_brake_lock,
+)
+from .energy import DriveCycleAccumulator, drive_cycle_energy
+from .engine import Engine, rated_engine
+from .articulated import articulated_system, articulated_loads, car_trailer_units
+from .downsample import lttb_indices, lttb
+from .pareto import DESIGN_BOUNDS, OBJECTIVES, evaluate_designs, dominance, nondominated_rank, crowding_distance, pareto_optimize
+from .metrics import (
+    RerunProfile, begin_rerun, set_mode, current_rerun, end_rerun, stage, timed, stage_stats, reset_metrics,
+    prometheus_text, serve_metrics, enable_json_log,
+)
+from .tire import WHEELS_PER_AXLE, TireModel, MagicFormulaTire, BrushTire, axle_grip
@@ -0,0 +1,141 @@
+import numpy as np
+
+from .vehicle import G
+
+# Veículo articulado com N unidades rígidas em série (carro + reboques, cavalo +
+# semirreboque + dolly, ...), em equilíbrio no plano longitudinal-vertical com rampa,
+# aceleração e frenagem (d'Alembert).
+#
+# Cada unidade é um dict; posições longitudinais em metros medidas PARA TRÁS a partir
+# de uma referência qualquer da própria unidade, alturas a partir do solo:
+#   'M'           massa (kg)
+#   's_cg', 'h'   posição e altura do CG
+#   'axles'       posições dos eixos
+#   'groups'      (opcional) um rótulo por eixo; eixos da mesma unidade com o mesmo
+#                 rótulo dividem a carga igualmente (suspensão equalizadora em tandem)
+#   'hitch_front' (s, z) do engate com a unidade anterior (todas menos a primeira)
+#   'hitch_rear'  (s, z) do engate com a unidade seguinte (todas menos a última)
+# Qualquer valor numérico pode ser array (B,): todas as configurações são montadas
+# numa pilha (B, n, n) e resolvidas com um único np.linalg.solve.
+#
+# Incógnitas: normal em cada eixo, força vertical V e longitudinal H em cada engate
+# (força da unidade i sobre a i+1; V > 0 para cima, H > 0 para a frente).
+# A força longitudinal no solo (tração ou frenagem) total é conhecida,
+# sum(M) * (g sin θ + ax), e é dividida entre os eixos por force_share; como
+# atua no nível do solo não gera momento. O equilíbrio longitudinal da última
+# unidade é redundante (já está no total) e fica de fora.
+
+def _unit_axles(units):
+    # Índice da unidade de cada eixo e rótulos de grupo
+    unit_of, groups = [], []
+    for i, u in enumerate(units):
+        n = len(u['axles'])
+        unit_of += [i] * n
+        groups += list(u.get('groups', [None] * n))
+    return np.array(unit_of, dtype=np.intp), groups
+
+def articulated_system(units, theta_rad=0.0, ax=0.0, force_share=None, g=G):
+    # Monta A (B..., n, n) e rhs (B..., n); colunas: normais dos eixos, V dos engates, H dos engates
+    n_units = len(units)
+    unit_of, groups = _unit_axles(units)
+    n_ax, n_hitch = len(unit_of), n_units - 1
+    n = n_ax + 2 * n_hitch
+    col_V = n_ax + np.arange(n_hitch)
+    col_H = n_ax + n_hitch + np.arange(n_hitch)
+
+    if force_share is None:
+        # Padrão: tração/frenagem dividida igualmente entre os eixos da primeira unidade
+        force_share = np.where(unit_of == 0, 1.0, 0.0) / np.count_nonzero(unit_of == 0)
+    force_share = np.asarray(force_share, dtype=float)
+
+    values = [theta_rad, ax, force_share[..., 0]]
+    for u in units:
+        values += [u['M'], u['s_cg'], u['h'], *u['axles'],
+                   *u.get('hitch_front', ()), *u.get('hitch_rear', ())]
+    batch = np.broadcast(*values).shape
+
+    M_total = sum(u['M'] for u in units)
+    F_ground = M_total * (g * np.sin(theta_rad) + ax)
+    Fx = force_share * np.expand_dims(F_ground, -1)   # (B..., n_ax)
+
+    A = np.zeros(batch + (n, n))
+    rhs = np.zeros(batch + (n,))
+    row = 0
+    axle = 0
+    for i, u in enumerate(units):
+        m, s_cg, h = u['M'], u['s_cg'], u['h']
+        own = range(axle, axle + len(u['axles']))
+        axle += len(u['axles'])
+        front = i > 0
+        rear = i < n_units - 1
+
+        # Vertical: sum(N) + V_ant - V_seg = m g cos θ
+        A[..., row, list(own)] = 1.0
+        if front:
+            A[..., row, col_V[i - 1]] = 1.0
+        if rear:
+            A[..., row, col_V[i]] = -1.0
+        rhs[..., row] = m * g * np.cos(theta_rad)
+        row += 1
+
+        # Momento em torno da referência da unidade (x para a frente = -s, z para cima):
+        # -sum(s N) - s_f V_ant - z_f H_ant + s_r V_seg + z_r H_seg = -(s_cg m g cos θ + h m (g sin θ + ax))
+        for k, s in zip(own, u['axles']):
+            A[..., row, k] = -np.asarray(s, dtype=float)
+        if front:
+            s_f, z_f = u['hitch_front']
+            A[..., row, col_V[i - 1]] = -np.asarray(s_f, dtype=float)
+            A[..., row, col_H[i - 1]] = -np.asarray(z_f, dtype=float)
+        if rear:
+            s_r, z_r = u['hitch_rear']
+            A[..., row, col_V[i]] = s_r
+            A[..., row, col_H[i]] = z_r
+        rhs[..., row] = -(s_cg * m * g * np.cos(theta_rad) + h * m * (g * np.sin(theta_rad) + ax))
+        row += 1
+
+        # Longitudinal: sum(Fx) + H_ant - H_seg = m (g sin θ + ax)
+        if rear:
+            if front:
+                A[..., row, col_H[i - 1]] = 1.0
+            A[..., row, col_H[i]] = -1.0
+            rhs[..., row] = m * (g * np.sin(theta_rad) + ax) - Fx[..., list(own)].sum(axis=-1)
+            row += 1
+
+    # Eixos equalizados: N_a - N_b = 0 dentro de cada grupo
+    first = {}
+    for k, (i, grp) in enumerate(zip(unit_of, groups)):
+        if grp is None:
+            continue
+        if (i, grp) in first:
+            if row >= n:
+                raise ValueError("sistema hiperestático: agrupe os eixos extras em 'groups'")
+            A[..., row, first[(i, grp)]] = 1.0
+            A[..., row, k] = -1.0
+            row += 1
+        else:
+            first[(i, grp)] = k
+    if row != n:
+        raise ValueError("sistema hiperestático: agrupe os eixos extras em 'groups'")
+    return A, rhs, Fx
+
+def articulated_loads(units, theta_rad=0.0, ax=0.0, force_share=None, g=G):
+    # Cargas em todos os eixos e engates. Devolve dict com
+    #   N (B..., n_eixos), Fx (B..., n_eixos), unit (n_eixos,) = unidade de cada eixo,
+    #   V_hitch e H_hitch (B..., N-1)
+    A, rhs, Fx = articulated_system(units, theta_rad, ax, force_share, g)
+    x = np.linalg.solve(A, rhs[..., None])[..., 0]
+    unit_of, _ = _unit_axles(units)
+    n_ax, n_hitch = len(unit_of), len(units) - 1
+    return {
+        'N': x[..., :n_ax], 'Fx': Fx, 'unit': unit_of,
+        'V_hitch': x[..., n_ax:n_ax + n_hitch], 'H_hitch': x[..., n_ax + n_hitch:],
+    }
+
+def car_trailer_units(M, L, b, h, Mt, Lt, lt_cg, lh, h_t=0.0, z_hitch=0.0):
+    # Carro (eixos em 0 e L, CG a b do dianteiro) + reboque de um eixo (engate em 0,
+    # eixo em Lt, CG a lt_cg à frente do eixo), engate lh atrás do eixo traseiro do carro.
+    # Com h_t = z_hitch = 0 reproduz trailer_loads.
+    return [
+        {'M': M, 's_cg': b, 'h': h, 'axles': [0.0, L], 'hitch_rear': (L + lh, z_hitch)},
+        {'M': Mt, 's_cg': Lt - lt_cg, 'h': h_t, 'axles': [Lt], 'hitch_front': (0.0, z_hitch)},
+    ]
@@ -0,0 +1,147 @@
+import numpy as np
+
+from .vehicle import G
+from .solvers import bisect
+from .tire import axle_grip
+
+# Distribuição de frenagem (Jazar/Limpert). Forças normalizadas pela normal total
+# N = W cos θ: z = Fb/N (coeficiente de frenagem), zf = Fbf/N, zr = Fbr/N.
+# Como a componente do peso ao longo da rampa age no CG como a inércia, as cargas
+# dinâmicas dependem só da força de frenagem:
+#   Wf = N (c + h z) / L,   Wr = N (b - h z) / L
+# e a desaceleração resultante é a = g (z cos θ + sin θ) (θ > 0 = subida).
+
+def ideal_braking_curve(W, L, b, c, h, z):
+    # Parábola ideal (as duas rodas no limite ao mesmo tempo) em pista plana:
+    # Fbf = z Wf(z), Fbr = z Wr(z)
+    return W * z * (c + h * z) / L, W * z * (b - h * z) / L
+
+def installed_braking_curve(zf, beta, knee=np.inf, slope=None):
+    # Força traseira instalada em função da dianteira: reta de proporção fixa
+    # zr = (1 - β)/β zf até o joelho zf = knee; depois inclinação "slope" (válvula
+    # de dois estágios). knee = inf representa distribuição fixa.
+    ratio = (1 - beta) / beta
+    if slope is None:
+        slope = ratio
+    k = np.where(np.isfinite(knee), knee, 0.0)
+    return np.where(zf <= knee, ratio * zf, ratio * k + slope * (zf - k))
+
+def lock_lines(W, L, b, c, h, mu, Fbf):
+    # Retas de travamento em pista plana, como Fbr em função de Fbf:
+    # dianteira trava quando Fbf = mu Wf, traseira quando Fbr = mu Wr
+    Fbr_front = (Fbf * (L - mu * h) - mu * W * c) / (mu * h)
+    Fbr_rear = mu * (W * b - h * Fbf) / (L + mu * h)
+    return Fbr_front, Fbr_rear
+
+def _segment_locks(p, q, lo, hi, mu, L, b, c, h):
+    # Num trecho zr = p + q zf, zf em [lo, hi], o zf em que cada eixo trava (inf se não trava)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        den_f = L - mu * h * (1 + q)
+        zf_front = np.where(den_f > 0, mu * (c + h * p) / den_f, np.inf)
+        den_r = q * L + mu * h * (1 + q)
+        zf_rear = np.where(den_r > 0, (mu * (b - h * p) - p * L) / den_r, np.inf)
+    valid = lambda zf: np.where((zf >= lo) & (zf <= hi), zf, np.inf)
+    return valid(zf_front), valid(zf_rear)
+
+def brake_lock(L, b, c, h, mu, beta, knee=np.inf, slope=None):
+    # Primeiro travamento ao aumentar o pedal ao longo da curva instalada.
+    # Devolve (z no travamento, eixo que trava primeiro: 0 = dianteiro, 1 = traseiro,
+    # eficiência z/mu). Eficiência 1 = a curva instalada cruza a ideal para este mu.
+    ratio = (1 - beta) / beta
+    if slope is None:
+        slope = ratio
+    knee = np.asarray(knee, dtype=float)
+    k = np.where(np.isfinite(knee), knee, 0.0)
+    f1, r1 = _segment_locks(0.0, ratio, 0.0, knee, mu, L, b, c, h)
+    f2, r2 = _segment_locks((ratio - slope) * k, slope, knee, np.inf, mu, L, b, c, h)
+    zf_front = np.minimum(f1, f2)
+    zf_rear = np.minimum(r1, r2)
+    rear_first = zf_rear < zf_front
+    zf = np.minimum(zf_front, zf_rear)
+    z = zf + installed_braking_curve(zf, beta, knee, slope)
+    return z, rear_first.astype(np.int8), z / mu
+
+# --- COM MODELO DE PNEU ---
+# Com TireModel o μ de cada roda cai com a carga: o eixo mais carregado perde atrito
+# relativo, sem forma fechada. Mesmas saídas das versões com μ constante, por bisseção
+# em z (as cargas continuam lineares em z).
+
+def tire_braking_decelerations(W, L, b, c, h, tire, mu_b, theta_rad, g=G):
+    # Como braking_decelerations: desaceleração máxima com 4 rodas, só dianteiro e só traseiro.
+    # Na rampa as cargas usam N = W cos θ (convenção deste módulo), então fora do plano os
+    # valores por eixo diferem um pouco da forma fechada de braking_decelerations.
+    N = W * np.cos(theta_rad)
+    Wf = lambda z: N * (c + h * z) / L
+    Wr = lambda z: np.maximum(N * (b - h * z) / L, 0.0)
+    z_hi = 3 * np.maximum(np.max(mu_b), 0.1)
+    z_ideal = bisect(lambda z: z * N - axle_grip(Wf(z), mu_b, tire) - axle_grip(Wr(z), mu_b, tire), 0.0, z_hi)
+    z_front = bisect(lambda z: z * N - axle_grip(Wf(z), mu_b, tire), 0.0, z_hi)
+    z_rear = bisect(lambda z: z * N - axle_grip(Wr(z), mu_b, tire), 0.0, z_hi)
+    dec = lambda z: g * (z * np.cos(theta_rad) + np.sin(theta_rad))
+    # Sem raiz no dianteiro = o ganho de carga acompanha a força (mesmo caso do 0 em braking_decelerations)
+    return dec(z_ideal), np.where(np.isfinite(z_front), dec(z_front), 0.0), dec(z_rear)
+
+def tire_brake_lock(W, L, b, c, h, tire, mu, beta, knee=np.inf, slope=None):
+    # Como brake_lock, percorrendo a curva instalada em zf: (z no travamento, eixo que
+    # trava primeiro, eficiência z/mu), em pista plana
+    zr_of = lambda zf: installed_braking_curve(zf, beta, knee, slope)
+    front = lambda zf: zf * W - axle_grip(W * (c + h * (zf + zr_of(zf))) / L, mu, tire)
+    rear = lambda zf: zr_of(zf) * W - axle_grip(np.maximum(W * (b - h * (zf + zr_of(zf))) / L, 0.0), mu, tire)
+    zf_hi = 3 * np.maximum(np.max(mu), 0.1)
+    zf_front = np.nan_to_num(bisect(front, 0.0, zf_hi), nan=np.inf)
+    zf_rear = np.nan_to_num(bisect(rear, 0.0, zf_hi), nan=np.inf)
+    rear_first = zf_rear < zf_front
+    zf = np.minimum(zf_front, zf_rear)
+    z = zf + zr_of(zf)
+    return z, rear_first.astype(np.int8), z / mu
+
+def payload_params(M, b, h, payload, b_payload, h_payload):
+    # Massa, posição e altura do CG com uma carga (kg) em (b_payload, h_payload)
+    M_total = M + payload
+    return M_total, (M * b + payload * b_payload) / M_total, (M * h + payload * h_payload) / M_total
+
+def optimize_brake_bias(M, L, b, h, mu, theta_rad, payload, b_payload=1.6, h_payload=0.6,
+                        betas=np.linspace(0.5, 0.95, 91), knees=None, slopes=None,
+                        max_rear_first=0.0, chunk=256):
+    # Escolhe a distribuição (fixa ou em dois estágios) que maximiza a pior eficiência
+    # sobre o envelope (mu, θ, carga): cada candidato é avaliado em todos os pontos do
+    # envelope de uma vez. mu, theta_rad e payload fazem broadcast entre si.
+    # Travar o traseiro primeiro é instável, então a escolha é lexicográfica: primeiro a
+    # menor fração do envelope com traseiro travando antes (frações até max_rear_first
+    # contam como zero), depois a maior pior eficiência. max_rear_first = 1 ignora a ordem.
+    # Sem knees/slopes, só distribuição fixa. Devolve dict com o melhor candidato,
+    # a pior eficiência dele, a pior desaceleração (m/s²) e a fração com traseiro primeiro.
+    mu, theta_rad, payload = (np.ravel(x) for x in np.broadcast_arrays(mu, theta_rad, payload))
+    _, b_e, h_e = payload_params(M, b, h, payload, b_payload, h_payload)
+    # A eficiência não depende de θ: basta avaliar os pares (mu, carga) distintos,
+    # pesando cada um pelo número de pontos do envelope que ele representa
+    pairs, counts = np.unique(np.column_stack([mu, payload]), axis=0, return_counts=True)
+    mu_u, payload_u = pairs.T
+    weights = counts / counts.sum()
+    _, b_u, h_u = payload_params(M, b, h, payload_u, b_payload, h_payload)
+
+    beta_c = np.asarray(betas, dtype=float)
+    if knees is None:
+        knee_c = np.full_like(beta_c, np.inf)
+        slope_c = (1 - beta_c) / beta_c
+    else:
+        grid = np.meshgrid(beta_c, np.asarray(knees, dtype=float), np.asarray(slopes, dtype=float), indexing='ij')
+        beta_c, knee_c, slope_c = (g.ravel() for g in grid)
+
+    worst = np.empty(beta_c.size)
+    rear_share = np.empty(beta_c.size)
+    for i in range(0, beta_c.size, chunk):
+        s = slice(i, i + chunk)
+        _, first, eff = brake_lock(L, b_u, L - b_u, h_u, mu_u, beta_c[s, None], knee_c[s, None], slope_c[s, None])
+        worst[s] = eff.min(axis=1)
+        rear_share[s] = first @ weights
+
+    excess = np.maximum(rear_share - max_rear_first, 0.0)
+    best = int(np.lexsort((-worst, excess))[0])
+    z, first, _ = brake_lock(L, b_e, L - b_e, h_e, mu, beta_c[best], knee_c[best], slope_c[best])
+    decel = G * (z * np.cos(theta_rad) + np.sin(theta_rad))
+    return {
+        'beta': beta_c[best], 'knee': knee_c[best], 'slope': slope_c[best],
+        'efficiency': worst[best], 'decel_min': decel.min(),
+        'rear_first_share': first.mean(), 'candidates': beta_c.size,
+    }
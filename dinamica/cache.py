@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+# Cache LRU limitado, com contadores, para reaproveitar cálculos entre reruns.
+# Os caches ficam registrados por nome no módulo: quando um script (ex.: app.py no
+# Streamlit) é reexecutado e redefine a função decorada, o mesmo cache é reutilizado.
+# Os resultados são compartilhados entre chamadas e não devem ser modificados.
+
+class LRUCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        # Calcula fora da trava: duas sessões podem calcular a mesma chave, sem problema
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self._data), 'maxsize': self.maxsize,
+            }
+
+_REGISTRY = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def get_cache(name, maxsize=128):
+    with _REGISTRY_LOCK:
+        cache = _REGISTRY.get(name)
+        if cache is None:
+            cache = _REGISTRY[name] = LRUCache(maxsize)
+        cache.maxsize = maxsize
+        return cache
+
+def freeze(obj):
+    # Converte argumentos em chave hashable (listas -> tuplas, arrays -> bytes)
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(o) for o in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, np.ndarray):
+        return (obj.shape, obj.dtype.str, obj.tobytes())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+def memoize(maxsize=128, name=None):
+    def decorator(fn):
+        cache = get_cache(name or f"{fn.__module__}.{fn.__qualname__}", maxsize)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = freeze((args, kwargs))
+            return cache.get(key, lambda: fn(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+def cache_stats():
+    # Contadores de todos os caches registrados, por nome
+    with _REGISTRY_LOCK:
+        caches = dict(_REGISTRY)
+    return {name: cache.stats() for name, cache in caches.items()}
+
+def clear_caches():
+    with _REGISTRY_LOCK:
+        caches = list(_REGISTRY.values())
+    for cache in caches:
+        cache.clear()
@@ -0,0 +1,103 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from .vehicle import DRIVE_TYPES
+from .fleet import DEFAULTS, drive_codes, evaluate_fleet
+
+# Linha de comando para avaliar uma frota (CSV ou Parquet, uma linha por veículo/cenário)
+# em todos os modos e gravar o resultado em Parquet, bloco a bloco, sem carregar a
+# entrada inteira na memória. Requer pyarrow (já instalado junto com o Streamlit).
+#
+#   python -m dinamica frota.csv resultados.parquet --set mu=0.7 --set theta_deg=10
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        sys.exit("pyarrow é necessário para ler/gravar a frota: pip install pyarrow")
+
+def iter_batches(path, batch_size):
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    if path.endswith('.parquet'):
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+    else:
+        # ~64 bytes por linha de CSV numérico
+        options = pacsv.ReadOptions(block_size=max(batch_size * 64, 1 << 20))
+        yield from pacsv.open_csv(path, read_options=options)
+
+def evaluate_batch(batch, overrides, simulate):
+    # Grava as entradas com os valores realmente usados: overrides substituem a coluna
+    # (ou entram como coluna nova) e drive_type sai com o nome completo de DRIVE_TYPES.
+    # ValueError se alguma linha tiver drive_type desconhecido.
+    import pyarrow as pa
+
+    columns = {name: batch.column(i).to_numpy(zero_copy_only=False)
+               for i, name in enumerate(batch.schema.names)}
+    n = batch.num_rows
+    for name, value in overrides.items():
+        columns[name] = np.full(n, value, dtype=object if name == 'drive_type' else float)
+    if 'drive_type' in columns:
+        columns['drive_type'] = np.asarray(DRIVE_TYPES, dtype=object)[drive_codes(columns['drive_type'])]
+    out = evaluate_fleet(columns, simulate=simulate)
+    inputs = {name: pa.array(values) for name, values in columns.items()}
+    arrays = list(inputs.values()) + [pa.array(np.ascontiguousarray(v)) for v in out.values()]
+    return pa.RecordBatch.from_arrays(arrays, names=list(inputs) + list(out))
+
+def parse_overrides(items):
+    overrides = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep or name not in DEFAULTS and not name.startswith('gear_'):
+            raise SystemExit(f"--set inválido: {item!r} (use NOME=VALOR; nomes: {', '.join(DEFAULTS)})")
+        if name == 'drive_type':
+            try:
+                value = DRIVE_TYPES[drive_codes(value)]
+            except ValueError as exc:
+                raise SystemExit(f"--set inválido: {exc}")
+        else:
+            value = float(value)
+        overrides[name] = value
+    return overrides
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m dinamica',
+        description="Avalia uma frota de veículos em todos os modos de análise e grava em Parquet.")
+    parser.add_argument('input', help="tabela de entrada (.csv ou .parquet)")
+    parser.add_argument('output', help="arquivo Parquet de saída")
+    parser.add_argument('--batch-size', type=int, default=1 << 18, help="linhas por bloco (padrão: %(default)s)")
+    parser.add_argument('--set', action='append', default=[], metavar='NOME=VALOR',
+                        help="fixa um parâmetro/cenário para todas as linhas (ex.: mu=0.7)")
+    parser.add_argument('--simulate', action='store_true',
+                        help="inclui a simulação de arrancada (0-100 km/h e 1/4 de milha)")
+    args = parser.parse_args(argv)
+
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    overrides = parse_overrides(args.set)
+    start = time.perf_counter()
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_batches(args.input, args.batch_size):
+            try:
+                result = evaluate_batch(batch, overrides, args.simulate)
+            except ValueError as exc:
+                raise SystemExit(f"erro nas linhas {rows} a {rows + batch.num_rows - 1}: {exc}")
+            if writer is None:
+                writer = pq.ParquetWriter(args.output, result.schema)
+            writer.write_batch(result)
+            rows += result.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{rows} linhas em {elapsed:.2f} s ({rows / max(elapsed, 1e-9) * 60:,.0f} linhas/min)", file=sys.stderr)
+    return 0
@@ -0,0 +1,88 @@
+import numpy as np
+
+from .vehicle import G
+from .solvers import bisect
+
+# Curva em regime permanente sobre pista com superelevação ϕ (a pista sobe para o lado
+# de fora da curva). Velocidade v (m/s), raio R (m), aceleração centrípeta ay = v²/R.
+# ty > 0 desloca o CG para o lado de dentro da curva. Tudo faz broadcast, então
+# v, R e ϕ podem formar uma grade 2D/3D inteira de uma vez.
+#
+# Equilíbrio no plano da seção (d'Alembert):
+#   N  = M (g cos ϕ + ay sin ϕ)                      normal total
+#   Fy = M (ay cos ϕ - g sin ϕ)                      atrito lateral necessário (p/ dentro)
+#   N_in = [(t/2 + ty) N - h Fy] / t,  N_out = N - N_in
+
+def cornering_loads(W, L, b, c, t, h, ty, v, R, phi_rad, g=G):
+    # Cargas por roda (dianteira/traseira x interna/externa), normal total e atrito lateral.
+    # A transferência lateral é dividida entre os eixos na proporção da carga estática.
+    M = W / g
+    ay = v**2 / R
+    cos_p, sin_p = np.cos(phi_rad), np.sin(phi_rad)
+    N = M * (g * cos_p + ay * sin_p)
+    Fy = M * (ay * cos_p - g * sin_p)
+    N_in = ((t/2 + ty) * N - h * Fy) / t
+    N_out = N - N_in
+    return {
+        'N': N, 'Fy': Fy, 'N_in': N_in, 'N_out': N_out,
+        'front_in': N_in * (c/L), 'front_out': N_out * (c/L),
+        'rear_in': N_in * (b/L), 'rear_out': N_out * (b/L),
+    }
+
+def cornering_limits(t, h, ty, mu_lat, phi_rad, g=G):
+    # Faixa de aceleração centrípeta (m/s²) sem tombar nem deslizar:
+    #   ay_roll:  roda interna descarrega (N_in = 0), tombamento para fora
+    #   ay_slide: Fy = mu N, derrapagem para fora
+    #   ay_min:   abaixo disso tomba (N_out = 0) ou desliza para dentro da pista inclinada
+    # Denominador <= 0 significa que o limite não existe (inf).
+    tan_p = np.tan(phi_rad)
+    arm_in, arm_out = t/2 + ty, t/2 - ty
+    with np.errstate(divide='ignore', invalid='ignore'):
+        den = h - arm_in * tan_p
+        ay_roll = np.where(den > 0, g * (arm_in + h * tan_p) / den, np.inf)
+        den = 1 - mu_lat * tan_p
+        ay_slide = np.where(den > 0, g * (tan_p + mu_lat) / den, np.inf)
+    ay_tip_in = g * (h * tan_p - arm_out) / (h + arm_out * tan_p)
+    ay_slide_in = g * (tan_p - mu_lat) / (1 + mu_lat * tan_p)
+    ay_min = np.maximum(np.maximum(ay_tip_in, ay_slide_in), 0.0)
+    return ay_roll, ay_slide, ay_min
+
+def max_cornering_speed(t, h, ty, mu_lat, phi_rad, R, g=G):
+    # Velocidade máxima (m/s) no raio R: o menor entre tombamento e derrapagem
+    ay_roll, ay_slide, _ = cornering_limits(t, h, ty, mu_lat, phi_rad, g)
+    return np.sqrt(R * np.minimum(ay_roll, ay_slide))
+
+def tire_cornering_limit(W, L, b, c, t, h, ty, tire, mu_lat, phi_rad, g=G):
+    # ay de derrapagem (m/s²) com TireModel: a soma dos picos das quatro rodas cai com a
+    # transferência lateral (μ sensível à carga), então o limite fica abaixo de cornering_limits.
+    # Bisseção em ay entre g tan ϕ (sem atrito necessário) e 20 g; inf se não derrapa.
+    def excess(ay):
+        loads = cornering_loads(W, L, b, c, t, h, ty, np.sqrt(ay), 1.0, phi_rad, g)
+        grip = sum(tire.max_force(loads[k], mu_lat) for k in ('front_in', 'front_out', 'rear_in', 'rear_out'))
+        return loads['Fy'] - grip
+    lo = np.maximum(g * np.tan(phi_rad), 0.0)
+    ay = bisect(excess, lo, np.broadcast_to(20 * g, np.shape(lo)), tol=1e-6)
+    return np.where(np.isnan(ay), np.inf, ay)
+
+def cornering_map(W, L, b, c, t, h, ty, mu_lat, v, R, phi_rad, g=G, tire=None):
+    # Mapa completo sobre a grade (v, R, ϕ): cargas por roda, limites e a utilização do
+    # limite lateral (>= 1 = instável): ay / min(ay_roll, ay_slide) acima e ay_min / ay
+    # abaixo, o que for maior. 'mode' indica qual limite superior vale em cada ponto
+    # (0 = tombamento, 1 = derrapagem); 'below_min' marca ay < ay_min (tomba ou desliza
+    # para dentro da pista inclinada). Tudo sai no formato completo da grade.
+    # Com tire (TireModel) a derrapagem vem de tire_cornering_limit.
+    out = cornering_loads(W, L, b, c, t, h, ty, v, R, phi_rad, g)
+    ay_roll, ay_slide, ay_min = cornering_limits(t, h, ty, mu_lat, phi_rad, g)
+    if tire is not None:
+        ay_slide = tire_cornering_limit(W, L, b, c, t, h, ty, tire, mu_lat, phi_rad, g)
+    ay = v**2 / R
+    shape = np.broadcast_shapes(np.shape(ay), np.shape(ay_roll), np.shape(ay_slide), np.shape(ay_min))
+    ay, ay_roll, ay_slide, ay_min = (np.broadcast_to(x, shape) for x in (ay, ay_roll, ay_slide, ay_min))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        under = np.where(ay_min > 0, ay_min / ay, 0.0)
+    out['ay'] = ay
+    out['ay_roll'], out['ay_slide'], out['ay_min'] = ay_roll, ay_slide, ay_min
+    out['utilization'] = np.maximum(ay / np.minimum(ay_roll, ay_slide), under)
+    out['mode'] = (ay_slide < ay_roll).astype(np.int8)
+    out['below_min'] = ay < ay_min
+    return out
@@ -0,0 +1,46 @@
+import numpy as np
+
+# Redução de pontos para gráficos com LTTB (Largest-Triangle-Three-Buckets):
+# mantém o primeiro e o último ponto e, em cada balde intermediário, o ponto que forma
+# o maior triângulo com o ponto escolhido no balde anterior e a média do balde seguinte.
+# Preserva picos, cantos e a forma da curva com um número fixo de pontos (orçamento
+# de pixels), ao contrário de pegar um ponto a cada k.
+
+def lttb_indices(x, y, n_out):
+    # Índices dos pontos mantidos. x e y são (..., n) (broadcast entre si: várias séries
+    # podem compartilhar o mesmo x); devolve (..., n_out), ou todos os índices se n <= n_out.
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    n = x.shape[-1]
+    batch = x.shape[:-1]
+    if n <= n_out or n_out < 3:
+        return np.broadcast_to(np.arange(n), batch + (n,)).copy()
+
+    # Baldes intermediários: n_out - 2 faixas de [1, n-1)
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.intp)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Média de cada balde (para ser o 3º vértice do balde anterior); o último usa o ponto final
+    counts = ends - starts
+    avg_x = np.add.reduceat(x[..., :n - 1], starts, axis=-1) / counts
+    avg_y = np.add.reduceat(y[..., :n - 1], starts, axis=-1) / counts
+    avg_x = np.concatenate([avg_x[..., 1:], x[..., -1:]], axis=-1)
+    avg_y = np.concatenate([avg_y[..., 1:], y[..., -1:]], axis=-1)
+
+    out = np.empty(batch + (n_out,), dtype=np.intp)
+    out[..., 0] = 0
+    out[..., -1] = n - 1
+    a = np.zeros(batch, dtype=np.intp)
+    for i, (s, e) in enumerate(zip(starts, ends)):
+        xa = np.take_along_axis(x, a[..., None], axis=-1)
+        ya = np.take_along_axis(y, a[..., None], axis=-1)
+        xs, ys = x[..., s:e], y[..., s:e]
+        area = np.abs((xa - avg_x[..., i:i + 1]) * (ys - ya) - (xa - xs) * (avg_y[..., i:i + 1] - ya))
+        a = s + np.argmax(area, axis=-1)
+        out[..., i + 1] = a
+    return out
+
+def lttb(x, y, n_out):
+    # (x, y) reduzidos a n_out pontos por série
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    idx = lttb_indices(x, y, n_out)
+    return np.take_along_axis(x, idx, axis=-1), np.take_along_axis(y, idx, axis=-1)
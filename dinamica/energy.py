@@ -0,0 +1,134 @@
+import numpy as np
+
+from .powertrain import wheel_speed_to_rpm, interp_table
+
+# Energia e consumo ao longo de um ciclo de condução (velocidade e rampa no tempo).
+# O ciclo é processado em blocos: o acumulador guarda só totais e histogramas de
+# tamanho fixo, então logs de vários GB podem vir de np.memmap / np.load(mmap_mode='r')
+# ou de qualquer fonte que entregue blocos.
+
+BSFC_CONSTANT = 260.0    # g/kWh, usado quando não há mapa de consumo
+FUEL_DENSITY = 0.745     # kg/L (gasolina)
+
+class DriveCycleAccumulator:
+    # Acumula um ciclo bloco a bloco (update) e resume no final (result).
+    #
+    # rpm_pts/torque_pts: curva de plena carga (limita o torque e marca pontos saturados).
+    # bsfc: (eixo_rpm, eixo_torque, tabela g/kWh) ou None para BSFC_CONSTANT.
+    # Troca de marcha: a marcha mais alta que mantém o motor entre rpm_min e a rotação
+    # máxima com torque disponível; abaixo de rpm_min na 1ª a embreagem patina.
+    # Com engine (Engine) a curva e, se bsfc não for dado, o mapa de consumo vêm do motor.
+    def __init__(self, vehicle, dt, rpm_pts=None, torque_pts=None, bsfc=None, rpm_min=1200.0,
+                 idle_fuel_rate=0.0, rpm_bins=64, torque_bins=64, engine=None):
+        self.vehicle = vehicle
+        self.dt = dt
+        self.engine = engine
+        if engine is not None:
+            rpm_pts, torque_pts = engine.rpm_pts, engine.torque_pts
+        self.rpm_pts = np.asarray(rpm_pts, dtype=float)
+        self.torque_pts = np.asarray(torque_pts, dtype=float)
+        self.bsfc = bsfc
+        self.rpm_min = rpm_min
+        self.idle_fuel_rate = idle_fuel_rate
+        self.ratios = np.asarray(vehicle.gear_ratios, dtype=float)
+        n_gears = len(self.ratios)
+
+        self.rpm_edges = np.linspace(0, self.rpm_pts[-1], rpm_bins + 1)
+        self.torque_edges = np.linspace(0, self.torque_pts.max(), torque_bins + 1)
+        self.operating_points = np.zeros((n_gears, rpm_bins, torque_bins), dtype=np.int64)
+        self.gear_time = np.zeros(n_gears)
+        self.samples = 0
+        self.distance = 0.0
+        self.E_wheel_pos = 0.0
+        self.E_wheel_neg = 0.0
+        self.E_engine = 0.0
+        self.fuel_g = 0.0
+        self.torque_limited = 0
+        self._v_last = None
+
+    def update(self, v, theta_rad=0.0):
+        veh = self.vehicle
+        v = np.asarray(v, dtype=float)
+        theta = np.broadcast_to(np.asarray(theta_rad, dtype=float), v.shape)
+        dt = self.dt
+
+        # Derivada para trás, emendando com a última amostra do bloco anterior
+        prev = np.empty_like(v)
+        prev[0] = v[0] if self._v_last is None else self._v_last
+        prev[1:] = v[:-1]
+        a = (v - prev) / dt
+        self._v_last = v[-1]
+
+        F = (veh.M * a + veh.W * (np.sin(theta) + veh.fr * np.cos(theta))
+             + 0.5 * veh.rho * veh.Cd * veh.Af * v * v)
+        P_wheel = F * v
+        self.E_wheel_pos += P_wheel[P_wheel > 0].sum() * dt
+        self.E_wheel_neg += P_wheel[P_wheel < 0].sum() * dt
+        self.distance += v.sum() * dt
+        self.samples += v.size
+
+        # Rotação e torque em cada marcha: (n, n_marchas)
+        rpm_g = wheel_speed_to_rpm(v[:, None], veh.tire_radius, self.ratios, veh.final_drive)
+        traction = np.maximum(F, 0.0)[:, None]
+        torque_g = traction * veh.tire_radius / (self.ratios * veh.final_drive * veh.eta_d)
+        available = self._full_load(rpm_g)
+        ok = (rpm_g >= self.rpm_min) & (rpm_g <= self.rpm_pts[-1]) & (torque_g <= available)
+        # Maior marcha viável; sem nenhuma viável, 1ª marcha
+        gear = np.where(ok.any(axis=1), len(self.ratios) - 1 - np.argmax(ok[:, ::-1], axis=1), 0)
+        rows = np.arange(v.size)
+        rpm = np.maximum(rpm_g[rows, gear], self.rpm_min)   # embreagem patinando em baixa
+        torque_req = torque_g[rows, gear]
+        torque = np.minimum(torque_req, self._full_load(rpm))
+        self.torque_limited += int(np.count_nonzero(torque_req > torque))
+
+        P_engine = torque * rpm * (2 * np.pi / 60)   # W
+        self.E_engine += P_engine.sum() * dt
+        if self.bsfc is not None:
+            bsfc = interp_table(rpm, torque, *self.bsfc)
+        elif self.engine is not None and self.engine.bsfc_table is not None:
+            bsfc = self.engine.bsfc(rpm, torque)
+        else:
+            bsfc = BSFC_CONSTANT
+        fuel_rate = np.where(P_engine > 0, bsfc * P_engine / 3.6e6, self.idle_fuel_rate)   # g/s
+        self.fuel_g += fuel_rate.sum() * dt
+
+        self.gear_time += np.bincount(gear, minlength=len(self.ratios)) * dt
+        pulling = P_engine > 0
+        i = np.clip(np.searchsorted(self.rpm_edges, rpm[pulling], side='right') - 1, 0, len(self.rpm_edges) - 2)
+        j = np.clip(np.searchsorted(self.torque_edges, torque[pulling], side='right') - 1, 0, len(self.torque_edges) - 2)
+        np.add.at(self.operating_points, (gear[pulling], i, j), 1)
+
+    def _full_load(self, rpm):
+        if self.engine is not None:
+            return self.engine.full_load(rpm)
+        return np.interp(np.clip(rpm, self.rpm_pts[0], self.rpm_pts[-1]), self.rpm_pts, self.torque_pts)
+
+    def result(self):
+        duration = self.samples * self.dt
+        fuel_L = self.fuel_g / 1000 / FUEL_DENSITY
+        return {
+            'duration_s': duration,
+            'distance_m': self.distance,
+            'E_wheel_traction_J': self.E_wheel_pos,
+            'E_wheel_braking_J': self.E_wheel_neg,
+            'E_engine_J': self.E_engine,
+            'fuel_g': self.fuel_g,
+            'fuel_L': fuel_L,
+            'fuel_L_100km': fuel_L / (self.distance / 1e5) if self.distance > 0 else np.nan,
+            'gear_time_s': self.gear_time.copy(),
+            'torque_limited_samples': self.torque_limited,
+            'operating_points': self.operating_points.copy(),
+            'rpm_edges': self.rpm_edges, 'torque_edges': self.torque_edges,
+        }
+
+def drive_cycle_energy(vehicle, speed, grade=0.0, dt=0.1, rpm_pts=None, torque_pts=None,
+                       chunk_size=1 << 20, **kwargs):
+    # Processa um ciclo inteiro em blocos de chunk_size amostras. speed (m/s) e grade (rad)
+    # podem ser arrays em disco (np.memmap, np.load(..., mmap_mode='r')): só um bloco
+    # por vez é lido para a memória.
+    acc = DriveCycleAccumulator(vehicle, dt, rpm_pts, torque_pts, **kwargs)
+    n = len(speed)
+    for start in range(0, n, chunk_size):
+        s = slice(start, min(start + chunk_size, n))
+        acc.update(speed[s], grade[s] if np.ndim(grade) else grade)
+    return acc.result()
@@ -0,0 +1,101 @@
+import numpy as np
+
+from .cache import memoize
+from .powertrain import interp_table
+
+CV = 735.5   # W por cv
+
+# Modelo de motor: curva de plena carga e, opcionalmente, mapa de BSFC (g/kWh).
+# As tabelas são reamostradas uma vez numa grade uniforme densa, então cada consulta
+# é O(1) (índice = aritmética, sem busca) e a mesma instância serve todas as marchas,
+# o simulador de arrancada, o ciclo de condução e as varreduras.
+
+class Engine:
+    def __init__(self, rpm, torque, bsfc=None, resolution=4096, bsfc_resolution=256):
+        # rpm/torque: curva de plena carga (rpm crescente, da marcha lenta ao corte).
+        # bsfc: (eixo_rpm, eixo_torque, tabela[i, j]) em g/kWh, ou None.
+        self.rpm_pts = np.asarray(rpm, dtype=float)
+        self.torque_pts = np.asarray(torque, dtype=float)
+        self.rpm_idle, self.rpm_limit = self.rpm_pts[0], self.rpm_pts[-1]
+
+        grid = np.linspace(self.rpm_idle, self.rpm_limit, resolution)
+        self._torque_lut = np.interp(grid, self.rpm_pts, self.torque_pts)
+        self._slope_lut = np.append(np.diff(self._torque_lut), 0.0)
+        self._inv_step = (resolution - 1) / (self.rpm_limit - self.rpm_idle)
+
+        self.bsfc_table = bsfc
+        if bsfc is not None:
+            rpm_axis, torque_axis, _ = (np.asarray(x, dtype=float) for x in bsfc)
+            self._bsfc_rpm = np.linspace(rpm_axis[0], rpm_axis[-1], bsfc_resolution)
+            self._bsfc_torque = np.linspace(torque_axis[0], torque_axis[-1], bsfc_resolution)
+            self._bsfc_lut = interp_table(self._bsfc_rpm[:, None], self._bsfc_torque[None, :], *bsfc)
+
+    @classmethod
+    def from_ratings(cls, torque_max, rpm_torque_max, power_max_hp, rpm_power_max, rpm_limit, rpm_idle=800.0):
+        # Curva de 4 pontos a partir dos dados de catálogo: no pico de potência o torque
+        # é P/ω (limitado ao torque máximo); marcha lenta e corte como na curva do app
+        torque_at_power = min(power_max_hp * CV / (rpm_power_max * 2 * np.pi / 60), torque_max)
+        return cls([rpm_idle, rpm_torque_max, rpm_power_max, rpm_limit],
+                   [torque_max * 0.7, torque_max, torque_at_power, torque_max * 0.6])
+
+    @classmethod
+    def from_csv(cls, full_load, bsfc=None, **kwargs):
+        # full_load: CSV com colunas rpm,torque (com cabeçalho).
+        # bsfc: CSV em grade, primeira linha = eixo de torque (a 1ª célula é ignorada),
+        # primeira coluna = eixo de rpm, demais células em g/kWh.
+        # Aceitam caminho ou objeto de arquivo.
+        table = np.loadtxt(full_load, delimiter=',', skiprows=1, ndmin=2)
+        bsfc_map = None
+        if bsfc is not None:
+            grid = np.atleast_2d(np.genfromtxt(bsfc, delimiter=','))
+            bsfc_map = (grid[1:, 0], grid[0, 1:], grid[1:, 1:])
+        return cls(table[:, 0], table[:, 1], bsfc_map, **kwargs)
+
+    def _lut(self, rpm):
+        x = (np.clip(rpm, self.rpm_idle, self.rpm_limit) - self.rpm_idle) * self._inv_step
+        i = x.astype(np.intp)
+        return i, x - i
+
+    def full_load(self, rpm):
+        # Torque máximo (Nm) na rotação rpm; fora da faixa satura nas pontas
+        i, frac = self._lut(np.asarray(rpm, dtype=float))
+        return self._torque_lut[i] + frac * self._slope_lut[i]
+
+    def power(self, rpm):
+        # Potência máxima (W)
+        return self.full_load(rpm) * np.asarray(rpm) * (2 * np.pi / 60)
+
+    def bsfc(self, rpm, torque):
+        # Consumo específico (g/kWh), bilinear na grade densa (O(1))
+        if self.bsfc_table is None:
+            raise ValueError("motor sem mapa de BSFC")
+        rpm_axis, torque_axis, lut = self._bsfc_rpm, self._bsfc_torque, self._bsfc_lut
+        x = (np.clip(rpm, rpm_axis[0], rpm_axis[-1]) - rpm_axis[0]) * ((len(rpm_axis) - 1) / (rpm_axis[-1] - rpm_axis[0]))
+        y = (np.clip(torque, torque_axis[0], torque_axis[-1]) - torque_axis[0]) * ((len(torque_axis) - 1) / (torque_axis[-1] - torque_axis[0]))
+        i = np.minimum(np.asarray(x).astype(np.intp), len(rpm_axis) - 2)
+        j = np.minimum(np.asarray(y).astype(np.intp), len(torque_axis) - 2)
+        tx, ty = x - i, y - j
+        return ((1 - tx) * (1 - ty) * lut[i, j] + tx * (1 - ty) * lut[i + 1, j]
+                + (1 - tx) * ty * lut[i, j + 1] + tx * ty * lut[i + 1, j + 1])
+
+    def optimal_shift_points(self, gear_ratios, samples=2048):
+        # Rotação (na marcha atual) da troca que maximiza a força trativa: troca quando a
+        # marcha seguinte passa a dar mais força na roda e continua dando até o corte;
+        # se isso nunca acontece, troca no corte. gear_ratios (..., n_marchas) ->
+        # (..., n_marchas - 1).
+        ratios = np.asarray(gear_ratios, dtype=float)
+        rpm = np.linspace(self.rpm_idle, self.rpm_limit, samples)
+        cur, nxt = ratios[..., :-1, None], ratios[..., 1:, None]
+        rpm_next = rpm * (nxt / cur)
+        F_cur = self.full_load(rpm) * cur
+        F_next = np.where(rpm_next >= self.rpm_idle, self.full_load(rpm_next), 0.0) * nxt
+        behind = F_next < F_cur
+        # Primeiro índice depois do último ponto em que a próxima marcha ainda perde
+        last_behind = samples - 1 - np.argmax(behind[..., ::-1], axis=-1)
+        idx = np.where(behind.any(axis=-1), np.minimum(last_behind + 1, samples - 1), 0)
+        return rpm[idx]
+
+@memoize(maxsize=64)
+def rated_engine(torque_max, rpm_torque_max, power_max_hp, rpm_power_max, rpm_limit, rpm_idle=800.0):
+    # Engine.from_ratings compartilhado: mesma instância (e tabelas) para as mesmas entradas
+    return Engine.from_ratings(torque_max, rpm_torque_max, power_max_hp, rpm_power_max, rpm_limit, rpm_idle)
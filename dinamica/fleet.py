@@ -0,0 +1,116 @@
+import numpy as np
+
+from .vehicle import G, DRIVE_TYPES, Vehicle
+from .formulas import (
+    parked_level_loads, parked_grade_loads, grade_rollover_angle,
+    banked_loads, banked_limits, braking_decelerations, trailer_loads,
+)
+from .powertrain import torque_curve
+from .simulation import simulate_acceleration
+
+# Avaliação de uma frota inteira (uma linha por veículo/cenário) em todos os modos
+# de análise do app, em forma de colunas. Colunas ausentes assumem os valores
+# padrão da interface (Onix); ângulos em graus, como nos sliders.
+DEFAULTS = {
+    # Veículo
+    'M': 1117.0, 'L': 2.55, 'b': 1.10, 'h': 0.55, 't': 1.50, 'ty': 0.0,
+    'Af': 2.1, 'Cd': 0.32, 'fr': 0.015, 'rho': 1.225,
+    'drive_type': DRIVE_TYPES[0], 'tire_radius': 0.30, 'final_drive': 4.0, 'eta_d': 0.90,
+    'torque_max': 160.0, 'rpm_torque_max': 2000.0, 'rpm_power_max': 5500.0, 'rpm_limit': 6500.0,
+    # Trailer
+    'Mt': 500.0, 'Lt': 2.0, 'lt_cg': 0.2, 'lh': 0.8,
+    # Cenários de cada modo
+    'mu': 0.85, 'theta_deg': 5.0, 'ax': 1.5,
+    'theta_parked': 15.0,
+    'phi': 10.0, 'mu_lat': 0.8,
+    'mu_b': 0.8, 'theta_b': 0.0,
+    'theta_t': 5.0,
+}
+
+DEFAULT_GEARS = (3.5, 2.1, 1.4, 1.0, 0.8)
+
+# Nomes aceitos para a tração: os de DRIVE_TYPES e as siglas (sem diferenciar maiúsculas)
+DRIVE_ALIASES = {name.split()[0].upper(): i for i, name in enumerate(DRIVE_TYPES)}
+
+def drive_codes(values):
+    # Índices em DRIVE_TYPES; ValueError com os nomes desconhecidos (drive_index mandaria
+    # esses para a linha "desconhecido" de DRIVE_SPLIT, com tração zero, sem aviso)
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        bad = np.unique(values[(values < 0) | (values >= len(DRIVE_TYPES))])
+        if bad.size:
+            raise ValueError(f"drive_type inválido: {', '.join(map(str, bad))} (índices válidos: 0 a {len(DRIVE_TYPES) - 1})")
+        return values.astype(np.intp)
+    names, inverse = np.unique(values.astype(str), return_inverse=True)
+    lookup = np.array([DRIVE_TYPES.index(n) if n in DRIVE_TYPES else DRIVE_ALIASES.get(n.strip().upper(), -1)
+                       for n in names], dtype=np.intp)
+    if (lookup < 0).any():
+        bad = names[lookup < 0]
+        raise ValueError(f"drive_type desconhecido: {', '.join(repr(str(b)) for b in bad)} "
+                         f"(use {', '.join(DRIVE_ALIASES)} ou {', '.join(DRIVE_TYPES)})")
+    return lookup[inverse].reshape(values.shape)
+
+def gear_matrix(columns, n):
+    # Relações de marcha a partir das colunas gear_1, gear_2, ... (NaN = marcha inexistente,
+    # preenchida com a anterior para manter a matriz retangular)
+    names = sorted((k for k in columns if k.startswith('gear_')), key=lambda k: int(k[5:]))
+    if not names:
+        return np.broadcast_to(np.asarray(DEFAULT_GEARS), (n, len(DEFAULT_GEARS)))
+    ratios = np.column_stack([np.asarray(columns[k], dtype=float) for k in names])
+    for j in range(1, ratios.shape[1]):
+        missing = np.isnan(ratios[:, j])
+        ratios[missing, j] = ratios[missing, j - 1]
+    return ratios
+
+def evaluate_fleet(columns, simulate=False):
+    # columns: dict nome -> array (n,). Devolve dict com as saídas dos cinco modos.
+    n = len(next(iter(columns.values()))) if columns else 1
+
+    def col(name):
+        value = columns.get(name, DEFAULTS[name])
+        if name == 'drive_type':
+            return drive_codes(value)
+        return np.broadcast_to(np.asarray(value, dtype=float), (n,))
+
+    M, L, b, h, t, ty = (col(k) for k in ('M', 'L', 'b', 'h', 't', 'ty'))
+    c = L - b
+    W = M * G
+    ratios = gear_matrix(columns, n)
+    vehicle = Vehicle(M, L, b, c, h, col('Af'), col('Cd'), col('fr'), col('rho'), col('drive_type'),
+                      col('tire_radius'), ratios, col('final_drive'), col('eta_d'))
+    out = {}
+
+    # Modo 1: aceleração na rampa
+    theta = np.radians(col('theta_deg'))
+    mu = col('mu')
+    loads = vehicle.batch_loads(col('ax'), theta, mu)
+    out['Wf_dyn'], out['Wr_dyn'] = loads['Wf'], loads['Wr']
+    out['F_trac_max'], out['F_resist'] = loads['Fmax'], loads['F_resist']
+    out['launch_ok'] = loads['Fmax'] > loads['F_resist']
+    out['amax_possible'] = np.where(out['launch_ok'], (loads['Fmax'] - loads['F_resist']) / M, np.nan)
+    if simulate:
+        rpm_pts, torque_pts = torque_curve(col('torque_max'), col('rpm_torque_max'),
+                                           col('rpm_power_max'), col('rpm_limit'))
+        sim = simulate_acceleration(vehicle, mu, rpm_pts, torque_pts, dt=0.02)
+        out['t_0_100'], out['t_quarter_mile'] = sim['t_0_100'], sim['t_quarter_mile']
+
+    # Modo 2: parado (plano e rampa)
+    out['Wf_static'], out['Wr_static'], out['W_left'], out['W_right'] = parked_level_loads(W, L, b, c, t, ty)
+    out['Wf_inc'], out['Wr_inc'] = parked_grade_loads(W, L, b, c, h, np.radians(col('theta_parked')))
+    out['lim_rollover_grade'] = grade_rollover_angle(c, h)
+
+    # Modo 3: superelevação
+    out['W_low'], out['W_high'] = banked_loads(W, t, h, np.radians(col('phi')))
+    out['lim_rollover_bank'], out['lim_slide_bank'] = banked_limits(t, h, col('mu_lat'))
+
+    # Modo 4: frenagem
+    out['dec_ideal'], out['dec_front'], out['dec_rear'] = braking_decelerations(
+        L, b, c, h, col('mu_b'), np.radians(col('theta_b')))
+
+    # Modo 5: trailer
+    W_engate, _, _, Wf_final, Wr_final = trailer_loads(
+        W, L, b, c, h, col('Mt') * G, col('Lt'), col('lt_cg'), col('lh'), np.radians(col('theta_t')))
+    out['W_engate'], out['Wf_trailer'], out['Wr_trailer'] = W_engate, Wf_final, Wr_final
+    out['wheelie'] = Wf_final <= 0
+
+    return {k: np.broadcast_to(v, (n,)) for k, v in out.items()}
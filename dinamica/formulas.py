@@ -0,0 +1,65 @@
+import numpy as np
+
+from .vehicle import G
+
+# Fórmulas fechadas dos modos de análise (Jazar). Todas aceitam escalares
+# ou arrays NumPy e fazem broadcast entre os argumentos.
+
+# --- VEÍCULO PARADO ---
+def parked_level_loads(W, L, b, c, t, ty):
+    # Cargas por eixo e por lado em pista plana
+    Wf = W * (c/L)
+    Wr = W * (b/L)
+    W_left = W * (0.5 + ty/t)
+    W_right = W * (0.5 - ty/t)
+    return Wf, Wr, W_left, W_right
+
+def parked_grade_loads(W, L, b, c, h, theta_rad):
+    # Cargas por eixo do veículo parado na rampa
+    Wf = (W/L) * (c*np.cos(theta_rad) - h*np.sin(theta_rad))
+    Wr = (W/L) * (b*np.cos(theta_rad) + h*np.sin(theta_rad))
+    return Wf, Wr
+
+def grade_rollover_angle(c, h):
+    # Ângulo (°) em que a dianteira perde contato (tombamento para trás)
+    return np.degrees(np.arctan(c/h))
+
+# --- PISTA COM SUPERELEVAÇÃO (BANKED ROAD) ---
+def banked_loads(W, t, h, phi_rad):
+    # Cargas nas rodas baixas (externas) e altas (internas)
+    W_low = (W/t) * ((t/2)*np.cos(phi_rad) + h*np.sin(phi_rad))
+    W_high = (W/t) * ((t/2)*np.cos(phi_rad) - h*np.sin(phi_rad))
+    return W_low, W_high
+
+def banked_limits(t, h, mu_lat):
+    # Limites (°) de tombamento lateral e de deslizamento
+    lim_tomb = np.degrees(np.arctan(t/(2*h)))
+    lim_slide = np.degrees(np.arctan(mu_lat))
+    return lim_tomb, lim_slide
+
+# --- FRENAGEM ---
+def braking_decelerations(L, b, c, h, mu_b, theta_rad, g=G):
+    # Desaceleração máxima com 4 rodas (ideal), só dianteiro e só traseiro
+    dec_ideal = g * (mu_b * np.cos(theta_rad) + np.sin(theta_rad))
+    
+    # Travamento eixos
+    den_f = 1 - mu_b * (h/L)
+    den_r = 1 + mu_b * (h/L)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dec_front = np.where(den_f > 0, (g * (mu_b * (c/L)) / den_f) + g*np.sin(theta_rad), 0.0)
+    dec_rear = (g * (mu_b * (b/L)) / den_r) + g*np.sin(theta_rad)
+    return dec_ideal, dec_front, dec_rear
+
+# --- TRAILER ---
+def trailer_loads(W, L, b, c, h, Wt, Lt, lt_cg, lh, theta_rad):
+    # Carga no engate e cargas por eixo do carro sem e com o trailer
+    W_engate = (Wt * np.cos(theta_rad)) * (lt_cg / Lt)
+    
+    # Cargas originais (sem trailer) na rampa
+    Wf_car, Wr_car = parked_grade_loads(W, L, b, c, h, theta_rad)
+
+    # Deltas
+    dWf = - (W_engate * lh) / L
+    dWr = W_engate * (1 + lh/L)
+
+    return W_engate, Wf_car, Wr_car, Wf_car + dWf, Wr_car + dWr
@@ -0,0 +1,227 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from .cache import cache_stats
+
+# Instrumentação leve (só biblioteca padrão): etapas cronometradas por rerun, contadores
+# agregados por (modo, etapa, tipo), log estruturado (uma linha JSON por rerun) e texto
+# no formato do Prometheus, opcionalmente servido por HTTP para coleta local.
+#
+# Tipos de etapa: 'compute' (física), 'data' (DataFrames), 'chart' (spec Altair/PNG e
+# envio ao navegador), 'io' (arquivos/imagens). Etapas podem ser aninhadas: cada uma
+# guarda o tempo total e o próprio (sem as filhas), então a soma dos tempos próprios
+# por tipo fecha com o tempo do rerun.
+
+KINDS = ('compute', 'data', 'chart', 'io')
+RERUN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float('inf'))
+
+_LOG_NAME = 'dinamica.metrics'
+_LOCK = threading.Lock()
+_STAGES = {}     # (modo, etapa, tipo) -> [chamadas, total, próprio, máximo]
+_RERUNS = {}     # modo -> [reruns, total, contagem por faixa de RERUN_BUCKETS]
+_current = ContextVar('dinamica_rerun', default=None)
+
+class RerunProfile:
+    # Etapas de um rerun, na ordem em que terminaram: (etapa, tipo, total_s, próprio_s)
+    def __init__(self, mode=''):
+        self.mode = mode
+        self.records = []
+        self.start = time.perf_counter()
+        self.elapsed = None
+        self._children = [0.0]
+
+    def by_kind(self):
+        # Tempo próprio somado por tipo; 'other' = resto do rerun (widgets, layout, texto)
+        out = dict.fromkeys(KINDS, 0.0)
+        for _, kind, _, own in self.records:
+            out[kind] = out.get(kind, 0.0) + own
+        elapsed = time.perf_counter() - self.start if self.elapsed is None else self.elapsed
+        out['other'] = max(elapsed - sum(out.values()), 0.0)
+        return out
+
+    def as_dict(self):
+        return {
+            'mode': self.mode, 'elapsed_s': self.elapsed, 'by_kind_s': self.by_kind(),
+            'stages': [{'stage': s, 'kind': k, 'total_s': t, 'self_s': o} for s, k, t, o in self.records],
+        }
+
+def begin_rerun(mode=''):
+    profile = RerunProfile(mode)
+    _current.set(profile)
+    return profile
+
+def set_mode(mode):
+    # O modo costuma ser conhecido só depois dos primeiros widgets
+    profile = _current.get()
+    if profile is not None:
+        profile.mode = mode
+
+def current_rerun():
+    return _current.get()
+
+def end_rerun():
+    # Fecha o rerun atual: atualiza contadores por modo e emite a linha de log
+    profile = _current.get()
+    if profile is None:
+        return None
+    _current.set(None)
+    profile.elapsed = time.perf_counter() - profile.start
+    with _LOCK:
+        entry = _RERUNS.setdefault(profile.mode, [0, 0.0, [0] * len(RERUN_BUCKETS)])
+        entry[0] += 1
+        entry[1] += profile.elapsed
+        for i, bound in enumerate(RERUN_BUCKETS):
+            if profile.elapsed <= bound:
+                entry[2][i] += 1
+    import logging
+    log = logging.getLogger(_LOG_NAME)
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps({'event': 'rerun', 'ts': time.time(), **profile.as_dict()}, ensure_ascii=False))
+    return profile
+
+@contextmanager
+def stage(name, kind='compute'):
+    # Cronometra o bloco; fora de um rerun só alimenta os contadores agregados
+    profile = _current.get()
+    if profile is not None:
+        profile._children.append(0.0)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        own = elapsed
+        mode = ''
+        if profile is not None:
+            own = elapsed - profile._children.pop()
+            profile._children[-1] += elapsed
+            profile.records.append((name, kind, elapsed, own))
+            mode = profile.mode
+        with _LOCK:
+            entry = _STAGES.setdefault((mode, name, kind), [0, 0.0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += own
+            entry[3] = max(entry[3], elapsed)
+
+def timed(name=None, kind='compute'):
+    # Decorador equivalente a "with stage(...)" em torno da função
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(label, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def stage_stats():
+    # Contadores agregados: lista de dicts (modo, etapa, tipo, chamadas, total, próprio, máximo)
+    with _LOCK:
+        items = [(k, list(v)) for k, v in _STAGES.items()]
+    return [{'mode': m, 'stage': s, 'kind': k, 'calls': v[0], 'total_s': v[1], 'self_s': v[2], 'max_s': v[3]}
+            for (m, s, k), v in items]
+
+def reset_metrics():
+    with _LOCK:
+        _STAGES.clear()
+        _RERUNS.clear()
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+def prometheus_text():
+    # Exposição no formato texto do Prometheus (etapas, reruns e caches)
+    with _LOCK:
+        stages = [(k, list(v)) for k, v in _STAGES.items()]
+        reruns = [(m, v[0], v[1], list(v[2])) for m, v in _RERUNS.items()]
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family('dinamica_stage_calls_total', 'counter', 'Execuções de cada etapa.')
+    for (m, s, k), v in stages:
+        lines.append(f'dinamica_stage_calls_total{{mode="{_label(m)}",stage="{_label(s)}",kind="{k}"}} {v[0]}')
+    family('dinamica_stage_seconds_total', 'counter', 'Tempo total de cada etapa (com etapas aninhadas).')
+    for (m, s, k), v in stages:
+        lines.append(f'dinamica_stage_seconds_total{{mode="{_label(m)}",stage="{_label(s)}",kind="{k}"}} {v[1]:.6f}')
+    family('dinamica_stage_self_seconds_total', 'counter', 'Tempo próprio de cada etapa (sem as aninhadas).')
+    for (m, s, k), v in stages:
+        lines.append(f'dinamica_stage_self_seconds_total{{mode="{_label(m)}",stage="{_label(s)}",kind="{k}"}} {v[2]:.6f}')
+    family('dinamica_stage_max_seconds', 'gauge', 'Maior duração observada de cada etapa.')
+    for (m, s, k), v in stages:
+        lines.append(f'dinamica_stage_max_seconds{{mode="{_label(m)}",stage="{_label(s)}",kind="{k}"}} {v[3]:.6f}')
+
+    family('dinamica_rerun_seconds', 'histogram', 'Duração dos reruns por modo.')
+    for m, count, total, buckets in reruns:
+        # end_rerun já conta cada rerun em todas as faixas que o contêm (cumulativo)
+        for bound, n in zip(RERUN_BUCKETS, buckets):
+            le = '+Inf' if bound == float('inf') else f'{bound:g}'
+            lines.append(f'dinamica_rerun_seconds_bucket{{mode="{_label(m)}",le="{le}"}} {n}')
+        lines.append(f'dinamica_rerun_seconds_sum{{mode="{_label(m)}"}} {total:.6f}')
+        lines.append(f'dinamica_rerun_seconds_count{{mode="{_label(m)}"}} {count}')
+
+    caches = cache_stats()
+    for metric, field, kind in (('dinamica_cache_hits_total', 'hits', 'counter'),
+                                ('dinamica_cache_misses_total', 'misses', 'counter'),
+                                ('dinamica_cache_evictions_total', 'evictions', 'counter'),
+                                ('dinamica_cache_size', 'size', 'gauge')):
+        family(metric, kind, f'Cache LRU: {field}.')
+        for name, s in caches.items():
+            lines.append(f'{metric}{{cache="{_label(name)}"}} {s[field]}')
+    return "\n".join(lines) + "\n"
+
+# --- SAÍDAS ---
+_SERVER = None
+_LOG_HANDLER = None
+
+def serve_metrics(port=9464, host='127.0.0.1'):
+    # Servidor HTTP em thread daemon com prometheus_text() em /metrics; idempotente
+    # (o Streamlit reexecuta o script, mas o servidor sobe uma vez por processo)
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    global _SERVER
+    with _LOCK:
+        if _SERVER is not None:
+            return _SERVER
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        _SERVER = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_SERVER.serve_forever, name='dinamica-metrics', daemon=True).start()
+        return _SERVER
+
+def enable_json_log(stream=None):
+    # Uma linha JSON por rerun no logger 'dinamica.metrics' (stderr por padrão); idempotente
+    import logging
+
+    global _LOG_HANDLER
+    with _LOCK:
+        if _LOG_HANDLER is None:
+            log = logging.getLogger(_LOG_NAME)
+            _LOG_HANDLER = logging.StreamHandler(stream or sys.stderr)
+            _LOG_HANDLER.setFormatter(logging.Formatter('%(message)s'))
+            log.addHandler(_LOG_HANDLER)
+            log.setLevel(logging.INFO)
+            log.propagate = False
@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+
+from .formulas import grade_rollover_angle, banked_limits, braking_decelerations
+from .simulation import traction_limit
+
+# Monte Carlo de tolerâncias: amostra M, b, h e mu em blocos NumPy, distribui os blocos
+# num pool de processos e acumula histogramas de faixa fixa (memória constante,
+# independente do número de amostras) de onde saem média, desvio e percentis.
+
+# Faixa e número de classes dos histogramas de cada métrica
+METRICS = {
+    'rollover_grade': (0.0, 90.0, 1 << 14),   # arctan(c/h), °
+    'rollover_bank': (0.0, 90.0, 1 << 14),    # arctan(t/(2h)), °
+    'dec_front': (-20.0, 20.0, 1 << 14),      # m/s²
+    'dec_rear': (-20.0, 20.0, 1 << 14),       # m/s²
+}
+
+class RunningStats:
+    # Estatística acumulada de uma métrica: histograma fixo + soma, soma dos quadrados, min e max.
+    # Valores fora da faixa caem nas classes das pontas (os percentis ficam saturados nelas).
+    def __init__(self, low, high, bins):
+        self.low, self.high, self.bins = low, high, bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        idx = ((values - self.low) * (self.bins / (self.high - self.low))).astype(np.intp)
+        np.clip(idx, 0, self.bins - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.bins)
+        self.n += values.size
+        self.total += values.sum()
+        self.total_sq += np.dot(values, values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.n += other.n
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        # Interpola linearmente dentro da classe que contém o percentil q (0-100)
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        cum = np.cumsum(self.counts)
+        target = q / 100 * self.n
+        k = np.clip(np.searchsorted(cum, target, side='left'), 0, self.bins - 1)
+        before = np.where(k > 0, cum[k - 1], 0)
+        frac = np.where(self.counts[k] > 0, (target - before) / np.maximum(self.counts[k], 1), 0.0)
+        width = (self.high - self.low) / self.bins
+        return np.clip(self.low + (k + frac) * width, self.min, self.max)
+
+    def summary(self, percentiles):
+        mean = self.total / self.n if self.n else np.nan
+        var = self.total_sq / self.n - mean**2 if self.n else np.nan
+        out = {'mean': mean, 'std': np.sqrt(max(var, 0.0)), 'min': self.min, 'max': self.max}
+        for q, v in zip(percentiles, self.percentile(percentiles)):
+            out[f'p{q:g}'] = v
+        return out
+
+def sample(rng, nominal, distributions, n):
+    # Amostra cada parâmetro: distributions[nome] = (método do Generator, *args), por exemplo
+    # ('normal', 1117, 30) ou ('uniform', 0.50, 0.60); os demais ficam no valor nominal.
+    out = {}
+    for name, value in nominal.items():
+        if name in distributions:
+            method, *args = distributions[name]
+            out[name] = getattr(rng, method)(*args, size=n)
+        else:
+            out[name] = value
+    return out
+
+def _evaluate_chunk(base, nominal, distributions, n, theta_rad, seed):
+    rng = np.random.default_rng(seed)
+    p = sample(rng, nominal, distributions, n)
+    M, b, h, mu, t = p['M'], p['b'], p['h'], p['mu'], p['t']
+    L = base.L
+    c = L - b
+
+    stats = {name: RunningStats(*spec) for name, spec in METRICS.items()}
+    stats['rollover_grade'].update(np.broadcast_to(grade_rollover_angle(c, h), (n,)))
+    stats['rollover_bank'].update(np.broadcast_to(banked_limits(t, h, mu)[0], (n,)))
+    _, dec_front, dec_rear = braking_decelerations(L, b, c, h, mu, theta_rad, base.g)
+    stats['dec_front'].update(np.broadcast_to(dec_front, (n,)))
+    stats['dec_rear'].update(np.broadcast_to(dec_rear, (n,)))
+
+    # Arrancada na rampa: limite de aderência (com transferência de carga) > resistências
+    vehicle = base.replace(M=M, b=b, c=c, h=h)
+    F_resist = vehicle.W * (np.sin(theta_rad) + base.fr * np.cos(theta_rad))
+    launch = np.broadcast_to(traction_limit(vehicle, mu, theta_rad, F_resist) > F_resist, (n,))
+    return stats, int(np.count_nonzero(launch)), n
+
+def monte_carlo_iter(base, distributions, n_samples, mu=0.8, t=1.5, theta_rad=0.0,
+                     chunk_size=250_000, workers=None, seed=0, percentiles=(1, 5, 50, 95, 99)):
+    # Gera o resumo acumulado a cada bloco concluído (percentis "correntes").
+    # Cada bloco tem semente própria derivada de SeedSequence(seed), então o resultado
+    # final não depende do número de processos nem da ordem de conclusão.
+    # workers=0 roda tudo no processo atual.
+    nominal = {'M': base.M, 'b': base.b, 'h': base.h, 'mu': mu, 't': t}
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    total = {name: RunningStats(*spec) for name, spec in METRICS.items()}
+    launched = done = 0
+
+    def accumulate(result):
+        nonlocal launched, done
+        stats, ok, n = result
+        for name, s in stats.items():
+            total[name].merge(s)
+        launched += ok
+        done += n
+        summary = {name: s.summary(percentiles) for name, s in total.items()}
+        summary['launch_success'] = launched / done
+        summary['n'] = done
+        return summary
+
+    args = [(base, nominal, distributions, n, theta_rad, s) for n, s in zip(sizes, seeds)]
+    if workers == 0:
+        for a in args:
+            yield accumulate(_evaluate_chunk(*a))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Mantém no máximo 2 blocos por processo em voo para limitar a memória
+        queue = iter(args)
+        pending = {pool.submit(_evaluate_chunk, *a) for _, a in zip(range(2 * workers), queue)}
+        while pending:
+            future = next(as_completed(pending))
+            pending.remove(future)
+            yield accumulate(future.result())
+            a = next(queue, None)
+            if a is not None:
+                pending.add(pool.submit(_evaluate_chunk, *a))
+
+def monte_carlo(base, distributions, n_samples, **kwargs):
+    # Resumo final (ver monte_carlo_iter)
+    summary = None
+    for summary in monte_carlo_iter(base, distributions, n_samples, **kwargs):
+        pass
+    return summary
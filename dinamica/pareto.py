@@ -0,0 +1,207 @@
+import os
+
+import numpy as np
+
+from .formulas import banked_limits
+from .braking import brake_lock
+from .solvers import max_launch_grade
+from .simulation import envelope_time_to_speed
+
+# Exploração do espaço de projeto da geometria com NSGA-II vetorizado: a população
+# inteira é avaliada de uma vez com as fórmulas do pacote (sem laço por candidato),
+# e a avaliação pode ser dividida em blocos num pool de processos. O sorteio fica todo
+# no processo principal, então o resultado não depende do número de processos.
+
+# Variáveis de projeto e faixas padrão (b entra como fração do entre-eixos, para c > 0)
+DESIGN_BOUNDS = {
+    'L': (2.40, 2.80),
+    'b_frac': (0.35, 0.55),
+    'h': (0.45, 0.65),
+    't': (1.40, 1.65),
+    'Cd': (0.26, 0.36),
+    'final_drive': (3.2, 4.8),
+    'beta': (0.55, 0.85),       # fração da frenagem no eixo dianteiro
+}
+
+# Objetivos: +1 = maximizar, -1 = minimizar
+OBJECTIVES = {
+    'launch_grade': +1,         # rampa máxima de arrancada (°)
+    'brake_efficiency': +1,     # pior eficiência de frenagem na faixa de mu
+    'rollover_angle': +1,       # ângulo de tombamento lateral (°)
+    't_0_100': -1,              # s (envelope quase-estático)
+    'drag_power': -1,           # kW na velocidade de cruzeiro
+}
+
+def evaluate_designs(base, engine, X, mu=0.85, mu_brake=np.linspace(0.3, 1.0, 8), v_cruise=120 / 3.6,
+                     t_ref=1.50, front_share=(0.50, 0.65)):
+    # X: dict variável -> array (N,). Os demais parâmetros vêm do veículo base.
+    # Empacotamento: a área frontal escala com a largura (bitola) e a altura da carroceria
+    # (altura do CG): Af = Af_base * (t / t_ref) * (h / h_base).
+    # Restrições (violação >= 0, 0 = viável): fração estática de carga no dianteiro dentro de
+    # front_share e eixo traseiro nunca travando primeiro na faixa mu_brake.
+    L, h, t = X['L'], X['h'], X['t']
+    b = X['b_frac'] * L
+    c = L - b
+    Af = base.Af * (t / t_ref) * (h / base.h)
+    vehicle = base.replace(L=L, b=b, c=c, h=h, Cd=X['Cd'], Af=Af, final_drive=X['final_drive'])
+
+    _, rear_first, eff = brake_lock(L[:, None], b[:, None], c[:, None], h[:, None], mu_brake, X['beta'][:, None])
+    t_100 = envelope_time_to_speed(vehicle, mu, engine, n_points=32)
+    objectives = {
+        'launch_grade': np.degrees(max_launch_grade(vehicle, mu)),
+        'brake_efficiency': eff.min(axis=1),
+        'rollover_angle': banked_limits(t, h, mu)[0],
+        't_0_100': np.where(np.isfinite(t_100), t_100, 1e3),
+        'drag_power': 0.5 * base.rho * X['Cd'] * Af * v_cruise ** 3 / 1000,
+    }
+    front = c / L
+    violation = (np.maximum(front_share[0] - front, 0) + np.maximum(front - front_share[1], 0)
+                 + rear_first.mean(axis=1) + ~np.isfinite(t_100))
+    return objectives, violation
+
+def _evaluate_chunk(base, engine, X, kwargs):
+    objectives, violation = evaluate_designs(base, engine, X, **kwargs)
+    return np.column_stack([-OBJECTIVES[k] * objectives[k] for k in OBJECTIVES]), violation
+
+# --- NSGA-II ---
+def dominance(F):
+    # D[i, j] = i domina j (F em sentido de minimização): melhor em algum objetivo e
+    # pior em nenhum. Operações no lugar para não alocar uma matriz por comparação.
+    n = len(F)
+    worse = np.zeros((n, n), dtype=bool)
+    better = np.zeros_like(worse)
+    tmp = np.empty_like(worse)
+    for k in range(F.shape[1]):
+        f = np.ascontiguousarray(F[:, k])
+        np.greater(f[:, None], f, out=tmp)
+        worse |= tmp
+        np.less(f[:, None], f, out=tmp)
+        better |= tmp
+    return better & ~worse
+
+def nondominated_rank(F, violation):
+    # Número do front (0 = não dominado) de cada ponto, com a regra de Deb para restrições:
+    # viável domina inviável e, entre inviáveis, menor violação domina. Só os viáveis
+    # precisam da matriz de dominância (fronts descascados sobre ela); os inviáveis já
+    # ficam ordenados pela violação, um front por valor distinto.
+    feasible = violation <= 0
+    rank = np.empty(len(F), dtype=np.intp)
+    D = dominance(F[feasible])
+    count = D.sum(axis=0)
+    rank_f = np.full(len(D), -1)
+    front = np.flatnonzero(count == 0)
+    r = 0
+    while front.size:
+        rank_f[front] = r
+        count -= D[front].sum(axis=0)
+        count[rank_f >= 0] = -1
+        front = np.flatnonzero(count == 0)
+        r += 1
+    rank[feasible] = rank_f
+    rank[~feasible] = r + np.unique(violation[~feasible], return_inverse=True)[1]
+    return rank
+
+def crowding_distance(F, rank):
+    # Distância de aglomeração dentro de cada front, todos os fronts de uma vez;
+    # extremos de cada front = inf
+    n = len(F)
+    distance = np.zeros(n)
+    for k in range(F.shape[1]):
+        order = np.lexsort((F[:, k], rank))
+        f, r = F[order, k], rank[order]
+        first = np.r_[True, r[1:] != r[:-1]]
+        last = np.r_[r[1:] != r[:-1], True]
+        starts = np.flatnonzero(first)
+        span = np.repeat(f[last] - f[first], np.diff(np.r_[starts, n]))
+        gap = np.zeros(n)
+        gap[1:-1] = f[2:] - f[:-2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            part = np.where(span > 0, gap / span, 0.0)
+        part[first | last] = np.inf
+        distance[order] += part
+    return distance
+
+def _tournament(rng, rank, crowd, n):
+    # Torneio binário: menor front, depois maior distância
+    a, b = rng.integers(0, len(rank), size=(2, n))
+    a_wins = (rank[a] < rank[b]) | ((rank[a] == rank[b]) & (crowd[a] >= crowd[b]))
+    return np.where(a_wins, a, b)
+
+def _variation(rng, P1, P2, eta_c=15.0, eta_m=20.0, p_cross=0.9):
+    # SBX + mutação polinomial no espaço normalizado [0, 1]
+    n, d = P1.shape
+    u = rng.random((n, d))
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta_c + 1)), (1 / (2 * (1 - u))) ** (1 / (eta_c + 1)))
+    cross = (rng.random((n, 1)) < p_cross) & (rng.random((n, d)) < 0.5)
+    child = np.where(cross, 0.5 * ((1 + beta) * P1 + (1 - beta) * P2), P1)
+
+    u = rng.random((n, d))
+    delta = np.where(u < 0.5, (2 * u) ** (1 / (eta_m + 1)) - 1, 1 - (2 * (1 - u)) ** (1 / (eta_m + 1)))
+    mutate = rng.random((n, d)) < 1 / d
+    return np.clip(child + mutate * delta, 0.0, 1.0)
+
+def pareto_optimize(base, engine, bounds=None, pop_size=1000, generations=40, seed=0, workers=0,
+                    callback=None, **kwargs):
+    # Front de Pareto sobre DESIGN_BOUNDS (ou bounds), maximizando/minimizando OBJECTIVES
+    # sob as restrições de evaluate_designs (kwargs vão para ela).
+    # workers: 0 = processo atual, None = todos os núcleos. callback(geração, rank, violação)
+    # é chamado a cada geração. Devolve dict com variáveis, objetivos e violação do front
+    # viável não dominado e também da população final ('population').
+    bounds = DESIGN_BOUNDS if bounds is None else bounds
+    names = list(bounds)
+    lo = np.array([bounds[k][0] for k in names])
+    hi = np.array([bounds[k][1] for k in names])
+    rng = np.random.default_rng(seed)
+
+    def decode(U):
+        return dict(zip(names, (lo + U * (hi - lo)).T))
+
+    pool = None
+    if workers != 0:
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count()
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+    def evaluate(U):
+        if pool is None:
+            return _evaluate_chunk(base, engine, decode(U), kwargs)
+        parts = np.array_split(U, workers)
+        results = list(pool.map(_evaluate_chunk, *zip(*[(base, engine, decode(p), kwargs) for p in parts])))
+        return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+    try:
+        U = rng.random((pop_size, len(names)))
+        F, violation = evaluate(U)
+        rank = nondominated_rank(F, violation)
+        crowd = crowding_distance(F, rank)
+        for gen in range(generations):
+            parents = _tournament(rng, rank, crowd, 2 * pop_size).reshape(2, pop_size)
+            children = _variation(rng, U[parents[0]], U[parents[1]])
+            F_c, v_c = evaluate(children)
+
+            # Elitismo: pais + filhos, fica com os melhores por (front, aglomeração)
+            U_all = np.concatenate([U, children])
+            F_all = np.concatenate([F, F_c])
+            v_all = np.concatenate([violation, v_c])
+            rank_all = nondominated_rank(F_all, v_all)
+            crowd_all = crowding_distance(F_all, rank_all)
+            keep = np.lexsort((-crowd_all, rank_all))[:pop_size]
+            U, F, violation = U_all[keep], F_all[keep], v_all[keep]
+            rank, crowd = rank_all[keep], crowd_all[keep]
+            if callback is not None:
+                callback(gen, rank, violation)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    def pack(mask):
+        X = {k: v[mask] for k, v in decode(U).items()}
+        objectives = {k: -OBJECTIVES[k] * F[mask, i] for i, k in enumerate(OBJECTIVES)}
+        return {'X': X, 'objectives': objectives, 'violation': violation[mask]}
+
+    front = (rank == 0) & (violation <= 0)
+    result = pack(front)
+    result['population'] = pack(np.ones(len(U), dtype=bool))
+    result['population']['rank'] = rank
+    return result
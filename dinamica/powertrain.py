@@ -0,0 +1,51 @@
+import numpy as np
+
+def torque_curve(torque_max, rpm_torque_max, rpm_power_max, rpm_limit, rpm_idle=800.0):
+    # Curva simplificada de torque em plena carga (4 pontos, interpolação linear).
+    # Com entradas em array (N,) devolve uma curva por linha, de forma (N, 4).
+    torque_max, *rpms = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (torque_max, rpm_idle, rpm_torque_max, rpm_power_max, rpm_limit)))
+    rpm_pts = np.stack(rpms, axis=-1)
+    torque_pts = torque_max[..., None] * np.array([0.7, 1.0, 0.9, 0.6])
+    return rpm_pts, torque_pts
+
+def interp_rows(x, xp, fp):
+    # np.interp com uma tabela por linha: x (N,), xp/fp (N, K) crescentes em xp
+    # (com xp/fp de forma (K,) é o próprio np.interp)
+    if np.ndim(xp) == 1:
+        return np.interp(x, xp, fp)
+    x = np.clip(x, xp[:, 0], xp[:, -1])
+    k = np.clip((x[:, None] >= xp[:, 1:-1]).sum(axis=1), 0, xp.shape[1] - 2)
+    rows = np.arange(len(x))
+    x0, x1 = xp[rows, k], xp[rows, k + 1]
+    f0, f1 = fp[rows, k], fp[rows, k + 1]
+    return f0 + (f1 - f0) * (x - x0) / np.where(x1 > x0, x1 - x0, 1.0)
+
+def wheel_speed_to_rpm(v, tire_radius, ratio, final_drive):
+    # Rotação do motor (rpm) para a velocidade v (m/s) numa dada relação
+    return v / tire_radius * ratio * final_drive * 60 / (2 * np.pi)
+
+def engine_tractive_force(torque, ratio, final_drive, eta_d, tire_radius):
+    # Força na roda (N) gerada pelo torque do motor numa dada relação
+    return torque * ratio * final_drive * eta_d / tire_radius
+
+def traction_curves(vehicle, rpm, torque, F_limit):
+    # Curvas de força trativa por marcha para a curva de torque (rpm, torque):
+    # velocidade (km/h) e força na roda (N) limitada a F_limit, forma (n_marchas, len(rpm))
+    ratios = np.asarray(vehicle.gear_ratios, dtype=float)[:, None]
+    v_kmh = ((rpm * 2 * np.pi / 60) * vehicle.tire_radius / (ratios * vehicle.final_drive)) * 3.6
+    ft = engine_tractive_force(torque, ratios, vehicle.final_drive, vehicle.eta_d, vehicle.tire_radius)
+    return v_kmh, np.minimum(ft, F_limit)
+
+def interp_table(x, y, xs, ys, table):
+    # Interpolação bilinear numa tabela table[i, j] definida nos eixos crescentes xs (I,) e ys (J,).
+    # Fora da tabela, satura nas bordas.
+    xs, ys, table = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float), np.asarray(table, dtype=float)
+    x = np.clip(x, xs[0], xs[-1])
+    y = np.clip(y, ys[0], ys[-1])
+    i = np.clip(np.searchsorted(xs, x, side='right') - 1, 0, len(xs) - 2)
+    j = np.clip(np.searchsorted(ys, y, side='right') - 1, 0, len(ys) - 2)
+    tx = (x - xs[i]) / (xs[i + 1] - xs[i])
+    ty = (y - ys[j]) / (ys[j + 1] - ys[j])
+    return ((1 - tx) * (1 - ty) * table[i, j] + tx * (1 - ty) * table[i + 1, j]
+            + (1 - tx) * ty * table[i, j + 1] + tx * ty * table[i + 1, j + 1])
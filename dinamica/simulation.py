@@ -0,0 +1,242 @@
+import numpy as np
+
+from .vehicle import DRIVE_SPLIT, drive_index
+from .powertrain import wheel_speed_to_rpm, engine_tractive_force, interp_rows
+from .tire import axle_grip
+
+V_100 = 100 / 3.6          # 100 km/h em m/s
+QUARTER_MILE = 402.336     # m
+
+def _grip_loads(vehicle, theta_rad, drive_type):
+    # Cargas estáticas na rampa, h/L e fração de cada eixo em DRIVE_SPLIT (sf, sr)
+    split = DRIVE_SPLIT[drive_index(drive_type)]
+    Wf_stat, Wr_stat = vehicle.dynamic_loads(0.0, theta_rad)
+    return Wf_stat, Wr_stat, vehicle.h / vehicle.L, split[..., 0], split[..., 1]
+
+def _grip_terms(vehicle, mu, theta_rad, drive_type):
+    # Termos do limite de aderência com transferência de carga:
+    #   F = mu*(sf*Wf + sr*Wr), Wf/Wr = dynamic_loads(ax), M*ax = F - F_resist
+    #   => F*(1 - mu*k) = F0 - mu*k*F_resist, com k = (sr - sf)*h/L
+    # Devolve (F0, mu*k).
+    Wf_stat, Wr_stat, hL, sf, sr = _grip_loads(vehicle, theta_rad, drive_type)
+    return mu * (sf * Wf_stat + sr * Wr_stat), mu * (sr - sf) * hL
+
+def _tire_grip(tire, mu, loads, F_resist, F, n_iter=4):
+    # Mesmo limite com o pneu: o pico de cada roda cai com a carga, então não há forma
+    # fechada. Iteração de ponto fixo F <- grip(cargas(F)) a partir da estimativa com μ
+    # constante F (contrai com fator ~ mu*h/L, poucas iterações bastam).
+    # loads = _grip_loads(...), já no formato de broadcast de F_resist.
+    Wf_stat, Wr_stat, hL, sf, sr = loads
+    F = np.where(np.isfinite(F), F, sf * axle_grip(Wf_stat, mu, tire) + sr * axle_grip(Wr_stat, mu, tire))
+    for _ in range(n_iter):
+        dW = hL * (F - F_resist)
+        F = sf * axle_grip(Wf_stat - dW, mu, tire) + sr * axle_grip(Wr_stat + dW, mu, tire)
+    return F
+
+def traction_limit(vehicle, mu, theta_rad, F_resist, drive_type=None, tire=None):
+    # Força trativa máxima já considerando a transferência de carga da própria aceleração.
+    # Se 1 - mu*k <= 0 o eixo trativo ganha carga mais rápido que a força cresce: sem limite.
+    # Com tire (TireModel) o limite vem do pico do pneu em cada roda (μ sensível à carga).
+    if drive_type is None:
+        drive_type = vehicle.drive_type
+    F0, mk = _grip_terms(vehicle, mu, theta_rad, drive_type)
+    den = 1 - mk
+    with np.errstate(divide='ignore', invalid='ignore'):
+        F = np.where(den > 0, (F0 - mk * F_resist) / den, np.inf)
+    if tire is not None:
+        loads = _grip_loads(vehicle, theta_rad, drive_type)
+        F = np.where(den > 0, _tire_grip(tire, mu, loads, F_resist, F), np.inf)
+    return F
+
+def simulate_acceleration(vehicle, mu, rpm_pts=None, torque_pts=None, theta_rad=0.0, shift_rpm=None,
+                          dt=0.01, t_end=60.0, t_distance=10.0, record=False, engine=None, tire=None):
+    # Arrancada em plena carga com troca de marchas, integrada em passo fixo
+    # (Euler semi-implícito) para N variantes ao mesmo tempo.
+    #
+    # Qualquer atributo numérico do veículo (M, h, Cd, tire_radius, ...), mu e theta_rad
+    # podem ser arrays de forma (N,); gear_ratios pode ser (n_marchas,) ou (N, n_marchas).
+    # A curva de torque (rpm_pts, torque_pts) pode ser única (K,) ou uma por variante (N, K).
+    # O motor sai em rpm_pts[..., 0] (embreagem patinando) e troca de marcha em shift_rpm
+    # (padrão: rpm_pts[..., -1], o corte).
+    #
+    # Com engine (Engine) a curva vem do motor e o torque é lido na tabela densa dele;
+    # shift_rpm='optimal' troca cada marcha no ponto de máxima força trativa
+    # (Engine.optimal_shift_points).
+    #
+    # Com tire (TireModel) a aderência de cada passo vem do pico do pneu com as cargas
+    # dinâmicas (μ sensível à carga), como um controle de tração ideal.
+    #
+    # dt troca precisão por vazão (custo ~ 1/dt). Medido com 10k variantes do Onix num
+    # núcleo, contra dt = 0.005: dt = 0.01 (padrão, usado no app) erra até ~0.003 s no
+    # 0–100 e leva ~1.0 s; dt = 0.02 erra até ~0.01 s e leva ~0.6 s (> 10k variantes/s).
+    # Lotes grandes (fleet, benchmarks) usam dt = 0.02.
+    ratios = np.atleast_2d(np.asarray(vehicle.gear_ratios, dtype=float))
+    if engine is not None:
+        rpm_pts, torque_pts = engine.rpm_pts, engine.torque_pts
+    rpm_pts = np.asarray(rpm_pts, dtype=float)
+    torque_pts = np.asarray(torque_pts, dtype=float)
+    rpm_launch, rpm_cut = rpm_pts[..., 0], rpm_pts[..., -1]
+    per_gear = None
+    if isinstance(shift_rpm, str):
+        if shift_rpm != 'optimal' or engine is None:
+            raise ValueError("shift_rpm='optimal' exige engine")
+        per_gear = engine.optimal_shift_points(ratios)
+        shift_rpm = None
+    if shift_rpm is None:
+        shift_rpm = rpm_cut
+
+    drive = drive_index(vehicle.drive_type)
+    n = np.broadcast(
+        vehicle.M, vehicle.L, vehicle.b, vehicle.c, vehicle.h, vehicle.Af, vehicle.Cd, vehicle.fr,
+        vehicle.rho, vehicle.tire_radius, vehicle.final_drive, vehicle.eta_d,
+        mu, theta_rad, drive, shift_rpm, ratios[:, 0], rpm_pts[..., 0]).size
+    if per_gear is not None:
+        n = np.broadcast(np.empty(n), per_gear[:, 0]).size
+
+    def full(p):
+        return np.broadcast_to(np.asarray(p, dtype=float), (n,))
+
+    M, r, fd, eta = full(vehicle.M), full(vehicle.tire_radius), full(vehicle.final_drive), full(vehicle.eta_d)
+    theta, shift_rpm = full(theta_rad), full(shift_rpm)
+    if rpm_pts.ndim == 2:
+        rpm_pts = np.broadcast_to(rpm_pts, (n, rpm_pts.shape[1]))
+        torque_pts = np.broadcast_to(torque_pts, rpm_pts.shape)
+        rpm_launch, rpm_cut = rpm_pts[:, 0], rpm_pts[:, -1]
+    ratios = np.broadcast_to(ratios, (n, ratios.shape[1]))
+    n_gears = ratios.shape[1]
+    # Rotação de troca por marcha (N, n_marchas); a última nunca troca
+    if per_gear is None:
+        shift_table = np.broadcast_to(shift_rpm[:, None], (n, n_gears))
+    else:
+        shift_table = np.broadcast_to(np.concatenate(
+            [per_gear, np.full((per_gear.shape[0], 1), np.inf)], axis=1), (n, n_gears))
+
+    # Resistências de rampa/rolamento e termos de aderência são constantes no tempo;
+    # só o arrasto muda a cada passo
+    F_static = full(vehicle.W * (np.sin(theta) + vehicle.fr * np.cos(theta)))
+    drag_k = full(0.5 * vehicle.rho * vehicle.Cd * vehicle.Af)
+    F_grip0, mk = (full(p) for p in _grip_terms(vehicle, mu, theta, drive))
+    den = 1 - mk
+    unbounded = den <= 0
+    den = np.where(unbounded, 1.0, den)
+    if tire is not None:
+        loads = tuple(full(p) for p in _grip_loads(vehicle, theta, drive))
+
+    idx = np.arange(n)
+    gear = np.zeros(n, dtype=np.intp)
+    v = np.zeros(n)
+    x = np.zeros(n)
+    t_100 = np.full(n, np.nan)
+    t_qm = np.full(n, np.nan)
+    v_qm = np.full(n, np.nan)
+    x_at = np.full(n, np.nan)
+    shift_t = np.full((n, max(n_gears - 1, 0)), np.nan)
+    shift_v = np.full((n, max(n_gears - 1, 0)), np.nan)
+
+    n_steps = int(np.ceil(t_end / dt))
+    if record:
+        hist_v = np.empty((n_steps + 1, n))
+        hist_x = np.empty((n_steps + 1, n))
+        hist_gear = np.empty((n_steps + 1, n), dtype=np.int8)
+        hist_v[0], hist_x[0], hist_gear[0] = v, x, gear
+
+    t = 0.0
+    step = 0
+    for step in range(1, n_steps + 1):
+        ratio = ratios[idx, gear]
+        rpm = wheel_speed_to_rpm(v, r, ratio, fd)
+
+        # Troca de marcha ao atingir a rotação de troca da marcha atual
+        up = (rpm >= shift_table[idx, gear]) & (gear < n_gears - 1)
+        if up.any():
+            shift_t[idx[up], gear[up]] = t
+            shift_v[idx[up], gear[up]] = v[up]
+            gear = gear + up
+            ratio = ratios[idx, gear]
+            rpm = wheel_speed_to_rpm(v, r, ratio, fd)
+
+        # Embreagem patinando abaixo da rotação de saída; corte de injeção acima do limite
+        rpm_eng = np.maximum(rpm, rpm_launch)
+        curve = engine.full_load(rpm_eng) if engine is not None else interp_rows(rpm_eng, rpm_pts, torque_pts)
+        torque = np.where(rpm_eng > rpm_cut, 0.0, curve)
+        F_engine = engine_tractive_force(torque, ratio, fd, eta, r)
+
+        F_resist = F_static + drag_k * v * v
+        F_grip = (F_grip0 - mk * F_resist) / den
+        if tire is not None:
+            F_grip = _tire_grip(tire, mu, loads, F_resist, F_grip)
+        F = np.where(unbounded, F_engine, np.minimum(F_engine, F_grip))
+        a = (F - F_resist) / M
+
+        v_new = np.maximum(v + a * dt, 0.0)
+        x_new = x + v_new * dt
+        t_new = t + dt
+
+        # Cruzamentos interpolados dentro do passo
+        hit = np.isnan(t_100) & (v_new >= V_100)
+        if hit.any():
+            t_100[hit] = t + dt * (V_100 - v[hit]) / (v_new[hit] - v[hit])
+        hit = np.isnan(t_qm) & (x_new >= QUARTER_MILE)
+        if hit.any():
+            frac = (QUARTER_MILE - x[hit]) / (x_new[hit] - x[hit])
+            t_qm[hit] = t + dt * frac
+            v_qm[hit] = v[hit] + frac * (v_new[hit] - v[hit])
+        if t < t_distance <= t_new:
+            x_at = x + (x_new - x) * (t_distance - t) / dt
+
+        v, x, t = v_new, x_new, t_new
+        if record:
+            hist_v[step], hist_x[step], hist_gear[step] = v, x, gear
+
+        # Para cedo quando todas as variantes já têm todos os resultados
+        if t >= t_distance and not np.isnan(t_100).any() and not np.isnan(t_qm).any():
+            break
+
+    result = {
+        't_0_100': t_100, 't_quarter_mile': t_qm, 'v_quarter_mile': v_qm,
+        'x_at_t': x_at, 'shift_t': shift_t, 'shift_v': shift_v,
+    }
+    if record:
+        result['t'] = np.arange(step + 1) * dt
+        result['v'] = hist_v[:step + 1]
+        result['x'] = hist_x[:step + 1]
+        result['gear'] = hist_gear[:step + 1]
+    return result
+
+def envelope_time_to_speed(vehicle, mu, engine, v_target=V_100, theta_rad=0.0, n_points=64, tire=None):
+    # Estimativa quase-estática de 0 a v_target sem integrar no tempo: em cada velocidade
+    # usa a marcha de maior força (troca ideal, sem tempo de troca), limitada pela aderência
+    # com transferência de carga, e t = ∫ M dv / (F - F_resist) pela regra do trapézio.
+    # Barata para milhares de variantes (N, n_points, n_marchas); inf se não chega a v_target.
+    ratios = np.atleast_2d(np.asarray(vehicle.gear_ratios, dtype=float))
+    drive = drive_index(vehicle.drive_type)
+    n = np.broadcast(vehicle.M, vehicle.L, vehicle.b, vehicle.h, vehicle.Cd, vehicle.Af,
+                     vehicle.tire_radius, vehicle.final_drive, vehicle.eta_d, mu, theta_rad,
+                     drive, ratios[:, 0]).size
+
+    def col(p):
+        return np.broadcast_to(np.asarray(p, dtype=float), (n,))[:, None]
+
+    v = np.linspace(0.0, v_target, n_points)
+    r, fd, eta = col(vehicle.tire_radius)[..., None], col(vehicle.final_drive)[..., None], col(vehicle.eta_d)[..., None]
+    ratio = np.broadcast_to(ratios, (n, ratios.shape[1]))[:, None, :]
+    rpm = np.maximum(wheel_speed_to_rpm(v[None, :, None], r, ratio, fd), engine.rpm_idle)
+    torque = np.where(rpm > engine.rpm_limit, 0.0, engine.full_load(rpm))
+    F_engine = engine_tractive_force(torque, ratio, fd, eta, r).max(axis=-1)
+
+    theta = col(theta_rad)
+    F_resist = col(vehicle.W) * (np.sin(theta) + col(vehicle.fr) * np.cos(theta)) \
+        + 0.5 * col(vehicle.rho) * col(vehicle.Cd) * col(vehicle.Af) * v * v
+    F_grip0, mk = (col(p) for p in _grip_terms(vehicle, mu, theta[:, 0], drive))
+    den = 1 - mk
+    with np.errstate(divide='ignore', invalid='ignore'):
+        F_grip = np.where(den > 0, (F_grip0 - mk * F_resist) / den, np.inf)
+    if tire is not None:
+        loads = tuple(col(p) for p in _grip_loads(vehicle, theta[:, 0], drive))
+        F_grip = np.where(den > 0, _tire_grip(tire, col(mu), loads, F_resist, F_grip), np.inf)
+    a = (np.minimum(F_engine, F_grip) - F_resist) / col(vehicle.M)
+
+    with np.errstate(divide='ignore'):
+        inv_a = np.where(a > 0, 1.0 / a, np.inf)
+    t = 0.5 * (inv_a[:, 1:] + inv_a[:, :-1]).sum(axis=1) * (v[1] - v[0])
+    return t
@@ -0,0 +1,66 @@
+import numpy as np
+
+from .vehicle import G, DRIVE_SPLIT, drive_index
+from .formulas import parked_grade_loads
+
+# Valores críticos calculados diretamente (sem varrer ângulos). Todos fazem broadcast
+# entre os argumentos; onde não há forma fechada, usar bisect().
+
+def bisect(f, lo, hi, tol=1e-9, maxiter=200):
+    # Raiz de f em [lo, hi] por bisseção, para arrays de intervalos ao mesmo tempo.
+    # f recebe e devolve arrays da forma de lo/hi; intervalos sem troca de sinal dão NaN.
+    lo, hi = (np.array(x, dtype=float) for x in np.broadcast_arrays(lo, hi))
+    f_lo, f_hi = f(lo), f(hi)
+    bracketed = np.sign(f_lo) != np.sign(f_hi)
+    for _ in range(maxiter):
+        mid = 0.5 * (lo + hi)
+        f_mid = f(mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+        if np.all(hi - lo <= tol):
+            break
+    return np.where(bracketed, 0.5 * (lo + hi), np.nan)
+
+def max_launch_grade(vehicle, mu, drive_type=None, tire=None):
+    # Maior rampa (rad) em que o veículo ainda arranca: max_tractive_force com as cargas
+    # estáticas na rampa igual a W*(sin θ + fr cos θ). Com Wf/Wr lineares em cos θ e sin θ:
+    #   A cos θ + B sin θ = sin θ + fr cos θ  =>  tan θ = (A - fr) / (1 - B)
+    # Limitada ao ângulo de tombamento para trás, arctan(c/h). Negativo = só arranca em descida.
+    # Com tire (TireModel) o μ de cada roda cai com a carga e a rampa sai por bisseção.
+    if drive_type is None:
+        drive_type = vehicle.drive_type
+    L, b, c, h = vehicle.L, vehicle.b, vehicle.c, vehicle.h
+    rollover = np.arctan(c / h)
+    if tire is not None:
+        def excess(theta):
+            Wf, Wr = vehicle.dynamic_loads(0.0, theta)
+            return (vehicle.max_tractive_force(Wf, Wr, mu, drive_type, tire)
+                    - vehicle.W * (np.sin(theta) + vehicle.fr * np.cos(theta)))
+        theta = bisect(excess, -np.pi / 2, rollover)
+        return np.where(excess(rollover) >= 0, rollover, theta)
+    split = DRIVE_SPLIT[drive_index(drive_type)]
+    sf, sr = split[..., 0], split[..., 1]
+    A = mu * (sf * c + sr * b) / L
+    B = mu * (sr - sf) * h / L
+    theta = np.minimum(np.arctan2(A - vehicle.fr, 1 - B), np.pi / 2)
+    return np.minimum(theta, rollover)
+
+def max_trailer_mass(W, L, b, c, h, Lt, lt_cg, lh, theta_rad, g=G):
+    # Massa do trailer (kg) que zera a carga no eixo dianteiro do carro (Wf_final = 0):
+    #   Wf_car = W_engate * lh / L,  W_engate = Wt cos θ * lt_cg / Lt
+    Wf_car, _ = parked_grade_loads(W, L, b, c, h, theta_rad)
+    with np.errstate(divide='ignore'):
+        Wt = Wf_car * L * Lt / (lh * lt_cg * np.cos(theta_rad))
+    return np.maximum(Wt, 0.0) / g
+
+def max_cg_height_grade(c, theta_rad):
+    # Altura do CG (m) em que a rampa θ atinge o tombamento para trás: arctan(c/h) = θ
+    with np.errstate(divide='ignore'):
+        return c / np.tan(theta_rad)
+
+def max_cg_height_bank(t, phi_rad):
+    # Altura do CG (m) em que a superelevação ϕ atinge o tombamento lateral: arctan(t/(2h)) = ϕ
+    with np.errstate(divide='ignore'):
+        return t / (2 * np.tan(phi_rad))
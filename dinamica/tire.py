@@ -0,0 +1,208 @@
+import numpy as np
+
+# Modelos de pneu com escorregamento combinado e μ sensível à carga, avaliados em lote.
+#
+# Convenções: Fz = carga vertical na roda (N), kappa = escorregamento longitudinal prático
+# (> 0 tração, < 0 frenagem, -1 = roda travada), alpha = ângulo de deriva (rad); Fy tem o
+# sinal de alpha. mu = atrito de pico na carga nominal Fz0 (padrão: mu0 do pneu); o pico
+# cai com a carga: mu(Fz) = mu * (1 + load_sensitivity * (Fz - Fz0) / Fz0), com Fz
+# limitado a Fz_max (o mesmo extremo da tabela, então max_force é o pico de forces()).
+#
+# Os dois modelos são escritos na mesma forma normalizada, com D = mu(Fz) * Fz:
+#   rho_x = kappa * Kx / (cx * D),  rho_y = alpha * Ky / (cy * D),  rho = |(rho_x, rho_y)|
+#   Fx = D * rho_x * hx(rho),       Fy = D * rho_y * hy(rho)
+# e a força resultante nunca passa de D (elipse de atrito). Rigidezes Kx(Fz) e Ky(Fz)
+# seguem as leis de carga da Magic Formula. O que depende só de Fz fica numa tabela
+# densa em Fz e as funções de forma h numa tabela densa em s = rho / (1 + rho) (cobre
+# rho até infinito): o núcleo vira índice + interpolação linear, sem funções
+# trigonométricas, processado em blocos que cabem no cache.
+
+_CHUNK = 1 << 14          # elementos por bloco do núcleo (temporários cabem no L2)
+WHEELS_PER_AXLE = 2
+
+class TireModel:
+    # Base comum: subclasses definem cx, cy e _shape(rho) -> (hx, hy).
+    cx = cy = 1.0
+
+    def __init__(self, mu0=1.0, Fz0=3000.0, load_sensitivity=-0.1, kx=20.0, kx_load=-0.2,
+                 ky=16.0, ky_load=1.7, Fz_max=None, resolution=1024, shape_resolution=4096):
+        # kx: rigidez longitudinal / Fz (por unidade de escorregamento) na carga nominal;
+        #     Kx = kx * Fz * exp(kx_load * dfz), dfz = (Fz - Fz0) / Fz0.
+        # ky: rigidez de deriva / Fz0 (por rad) na carga nominal;
+        #     Ky = ky * Fz0 * sin(2 atan(Fz / (ky_load Fz0))) / sin(2 atan(1 / ky_load)).
+        # Tabela em Fz de 0 a Fz_max (padrão 4 Fz0); acima disso os coeficientes ficam no extremo.
+        self.mu0, self.Fz0, self.load_sensitivity = mu0, Fz0, load_sensitivity
+        self.kx, self.kx_load, self.ky, self.ky_load = kx, kx_load, ky, ky_load
+        self.Fz_max = 4 * Fz0 if Fz_max is None else Fz_max
+
+        Fz = np.linspace(0.0, self.Fz_max, resolution)
+        Fz_safe = np.maximum(Fz, 1e-6 * Fz0)
+        dfz = (Fz - Fz0) / Fz0
+        lam = self._load_factor(Fz)
+        Kx_per_Fz = kx * np.exp(kx_load * dfz)
+        Ky_per_Fz = ky * Fz0 * np.sin(2 * np.arctan(Fz_safe / (ky_load * Fz0))) / np.sin(2 * np.arctan(1 / ky_load)) / Fz_safe
+        # Colunas: fator de pico, Kx/(cx D) e Ky/(cy D) com mu = 1 (dividir por mu no uso)
+        self._fz_table = self._pack(lam, Kx_per_Fz / (self.cx * lam), Ky_per_Fz / (self.cy * lam))
+        self._fz_scale = (resolution - 1) / self.Fz_max
+        self._fz_last = resolution - 1.0
+
+        s = np.linspace(0.0, 1.0, shape_resolution)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rho = s / (1 - s)
+        self._shape_table = self._pack(*self._shape(rho))
+        self._s_scale = shape_resolution - 1
+
+    def _load_factor(self, Fz):
+        # mu(Fz) / mu; acima de Fz_max fica no valor do extremo, como na tabela do núcleo
+        dfz = (np.minimum(Fz, self.Fz_max) - self.Fz0) / self.Fz0
+        return np.maximum(1 + self.load_sensitivity * dfz, 1e-6)
+
+    def peak_mu(self, Fz, mu=None):
+        mu = self.mu0 if mu is None else mu
+        return mu * self._load_factor(np.asarray(Fz, dtype=float))
+
+    def max_force(self, Fz, mu=None):
+        # Força máxima (resultante) da roda: pico da curva, escorregamento ótimo
+        Fz = np.maximum(Fz, 0.0)
+        return self.peak_mu(Fz, mu) * Fz
+
+    def stiffness(self, Fz):
+        # (Kx, Ky) em N por unidade de escorregamento e N/rad; acima de Fz_max os
+        # coeficientes por carga ficam no extremo da tabela, como em forces()
+        Fz = np.maximum(np.asarray(Fz, dtype=float), 0.0)
+        pos = self._clamp(np.ravel(Fz * self._fz_scale), self._fz_last)
+        lam, gx, gy = (c.reshape(Fz.shape) for c in self._lookup(self._fz_table, pos))
+        D = lam * Fz
+        return gx * self.cx * D, gy * self.cy * D
+
+    @staticmethod
+    def _pack(*columns):
+        # Cada coluna vira (valor, diferença para o próximo ponto): a interpolação fica em
+        # duas leituras 1D (np.take em vetor 1D é bem mais rápido que indexar linhas 2D)
+        return [(np.ascontiguousarray(v, dtype=float), np.diff(v, append=v[-1]).astype(float)) for v in columns]
+
+    @staticmethod
+    def _clamp(pos, last):
+        # Posição dentro de [0, last] antes de virar índice (fmax/fmin levam NaN para 0;
+        # quem chama marca as saídas de entradas inválidas)
+        np.fmax(pos, 0.0, out=pos)
+        np.fmin(pos, last, out=pos)
+        return pos
+
+    @staticmethod
+    def _lookup(columns, pos):
+        # Interpolação linear de cada coluna na posição (fracionária, já dentro da tabela) pos
+        i = pos.astype(np.intp)
+        w = pos - i
+        out = []
+        for value, delta in columns:
+            y = delta.take(i)
+            y *= w
+            y += value.take(i)
+            out.append(y)
+        return out
+
+    def _kernel(self, Fz, kappa, alpha, mu, Fx, Fy):
+        # Um bloco (arrays 1D contíguos); escreve em Fx e Fy. Como D * rho_x não depende
+        # de mu, mu só entra em rho: mu minúsculo leva rho a inf (h = 0, força 0) sem
+        # produzir inf * 0. Entrada não finita dá NaN; mu <= 0 dá força 0.
+        with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+            Fz = np.maximum(Fz, 0.0)
+            pos = Fz * self._fz_scale
+            D, gx, gy = self._lookup(self._fz_table, self._clamp(pos, self._fz_last))
+            D *= Fz
+            gx *= kappa                 # gx = mu * rho_x
+            gy *= alpha
+            rho = np.hypot(gx, gy)
+            rho /= mu
+            # s = rho / (1 + rho) sem inf / inf quando rho estoura
+            s = 1 + rho
+            np.reciprocal(s, out=s)
+            np.subtract(1, s, out=s)
+            s *= self._s_scale
+            hx, hy = self._lookup(self._shape_table, self._clamp(s, self._s_scale))
+            np.multiply(D, gx, out=Fx)
+            Fx *= hx
+            np.multiply(D, gy, out=Fy)
+            Fy *= hy
+            check = Fz + kappa
+            check += alpha
+            check += mu
+        bad = ~np.isfinite(check)
+        if bad.any():
+            Fx[bad] = np.nan
+            Fy[bad] = np.nan
+        off = mu <= 0
+        if off.any():
+            Fx[off & ~bad] = 0.0
+            Fy[off & ~bad] = 0.0
+
+    def forces(self, Fz, kappa, alpha=0.0, mu=None):
+        # (Fx, Fy) com escorregamento combinado; todos os argumentos fazem broadcast
+        mu = self.mu0 if mu is None else mu
+        arrays = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (Fz, kappa, alpha, mu)))
+        shape = arrays[0].shape
+        Fz, kappa, alpha, mu = (np.ascontiguousarray(a).reshape(-1) for a in arrays)
+        Fx = np.empty(Fz.size)
+        Fy = np.empty(Fz.size)
+        for i in range(0, Fz.size, _CHUNK):
+            s = slice(i, i + _CHUNK)
+            self._kernel(Fz[s], kappa[s], alpha[s], mu[s], Fx[s], Fy[s])
+        return Fx.reshape(shape), Fy.reshape(shape)
+
+    def longitudinal(self, Fz, kappa, mu=None):
+        return self.forces(Fz, kappa, 0.0, mu)[0]
+
+    def lateral(self, Fz, alpha, mu=None):
+        return self.forces(Fz, 0.0, alpha, mu)[1]
+
+class MagicFormulaTire(TireModel):
+    # Magic Formula (Pacejka) pura: F = D sin(C atan(B u - E (B u - atan(B u)))), B = K / (C D).
+    # O combinado usa o escorregamento normalizado pelo pico de cada direção (rho = 1 no pico
+    # das duas), o que dá a elipse de atrito sem os coeficientes de ponderação do MF completo.
+    def __init__(self, Cx=1.65, Ex=0.3, Cy=1.3, Ey=-1.0, **kwargs):
+        self.Cx, self.Ex, self.Cy, self.Ey = Cx, Ex, Cy, Ey
+        self.u_px = self._peak(Cx, Ex)
+        self.u_py = self._peak(Cy, Ey)
+        self.cx, self.cy = Cx * self.u_px, Cy * self.u_py
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def _curve(u, C, E):
+        return np.sin(C * np.arctan(u - E * (u - np.arctan(u))))
+
+    @classmethod
+    def _peak(cls, C, E):
+        # B u do pico (f = 1 quando C atan(...) = π/2, C > 1)
+        u = np.linspace(0.0, 50.0, 200001)
+        return u[np.argmax(cls._curve(u, C, E))]
+
+    def _shape(self, rho):
+        # h(rho) = f(rho u_p) / rho; h(0) = C u_p e h -> 0 com rho -> inf
+        out = []
+        for C, E, u_p in ((self.Cx, self.Ex, self.u_px), (self.Cy, self.Ey, self.u_py)):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                h = self._curve(rho * u_p, C, E) / rho
+            h[0] = C * u_p
+            h[~np.isfinite(rho)] = 0.0
+            out.append(h)
+        return out
+
+class BrushTire(TireModel):
+    # Modelo de escova (pressão parabólica, escorregamento prático), isotrópico no combinado:
+    # phi = |(Kx kappa, Ky alpha)| / (3 D),  F = D (1 - (1 - phi)^3) para phi < 1, D acima.
+    cx = cy = 3.0
+
+    def _shape(self, rho):
+        # h(phi) = (1 - (1 - phi)^3) / phi = 3 - 3 phi + phi^2 (phi < 1), 1 / phi acima
+        with np.errstate(divide='ignore', invalid='ignore'):
+            h = np.where(rho < 1, 3 - 3 * rho + rho * rho, 1 / rho)
+        h[~np.isfinite(rho)] = 0.0
+        return h, h
+
+def axle_grip(W_axle, mu, tire=None):
+    # Força máxima de um eixo com carga W_axle: mu * W (μ constante, tire=None) ou a soma
+    # das rodas no pico da curva do pneu (μ cai com a carga de cada roda)
+    if tire is None:
+        return mu * W_axle
+    return WHEELS_PER_AXLE * tire.max_force(np.asarray(W_axle) / WHEELS_PER_AXLE, mu)
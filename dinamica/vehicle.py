@@ -0,0 +1,256 @@
+import hashlib
+
+import numpy as np
+
+from .cache import freeze
+from .tire import axle_grip
+
+G = 9.81
+
+DRIVE_TYPES = ['FWD (Tração Dianteira)', 'RWD (Tração Traseira)', 'AWD (Tração Integral)']
+
+# Fração da carga de cada eixo (dianteiro, traseiro) disponível para tração.
+# A última linha cobre tipos desconhecidos (Fmax = 0).
+DRIVE_SPLIT = np.array([
+    [1.0, 0.0],
+    [0.0, 1.0],
+    [1.0, 1.0],
+    [0.0, 0.0],
+])
+
+def drive_index(drive_type):
+    # Converte nome(s) de tração em índices de DRIVE_SPLIT; inteiros passam direto
+    codes = np.asarray(drive_type)
+    if codes.dtype.kind in 'iu':
+        return codes.astype(np.intp)
+    names, inverse = np.unique(codes, return_inverse=True)
+    lookup = np.array([DRIVE_TYPES.index(n) if n in DRIVE_TYPES else len(DRIVE_TYPES) for n in names], dtype=np.intp)
+    return lookup[inverse].reshape(codes.shape)
+
+FIELDS = ('M', 'L', 'b', 'c', 'h', 'Af', 'Cd', 'fr', 'rho', 'drive_type', 'tire_radius',
+          'gear_ratios', 'final_drive', 'eta_d')
+
+def _frozen(value):
+    # Listas viram tuplas e arrays viram cópias somente-leitura: uma vista dividiria o
+    # buffer com o chamador, que poderia mudar o valor depois de W, _key e _hash prontos
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, np.ndarray):
+        value = np.array(value)
+        value.flags.writeable = False
+    return value
+
+class VehicleModel:
+    # Modelo de cargas comum a Vehicle (um registro) e VehicleBatch (colunas): só lê
+    # atributos, então qualquer um deles vale onde os campos fazem broadcast com o eixo
+    # das variantes (ver README: funções com eixo próprio pedem um único Vehicle).
+    __slots__ = ()
+    g = G
+
+    def dynamic_loads(self, ax, theta_rad):
+        # ax positivo = aceleração, negativo = frenagem
+        # Aceita escalares ou arrays NumPy (broadcast entre ax e theta_rad)
+        W = self.W
+        L, c, b, h = self.L, self.c, self.b, self.h
+        cos_t, sin_t = np.cos(theta_rad), np.sin(theta_rad)
+        
+        # Cargas Estáticas na rampa (sem inércia)
+        Wf_stat = (c / L) * W * cos_t - (h / L) * W * sin_t
+        Wr_stat = (b / L) * W * cos_t + (h / L) * W * sin_t
+
+        # Transferência de Carga Longitudinal devido à aceleração ax
+        Delta_W_inertia = (h / L) * (np.asarray(ax) * self.M)
+        
+        Wf = Wf_stat - Delta_W_inertia
+        Wr = Wr_stat + Delta_W_inertia
+        
+        return Wf, Wr
+
+    def max_tractive_force(self, Wf, Wr, mu, drive_type=None, tire=None):
+        # drive_type pode ser um nome, um índice ou um array deles (padrão: o do veículo).
+        # Com tire (TireModel) o limite de cada eixo vem do pico do pneu, sensível à carga.
+        if drive_type is None:
+            drive_type = self.drive_type
+        split = DRIVE_SPLIT[drive_index(drive_type)]
+        if tire is None:
+            return mu * (split[..., 0] * Wf + split[..., 1] * Wr)
+        return split[..., 0] * axle_grip(Wf, mu, tire) + split[..., 1] * axle_grip(Wr, mu, tire)
+
+    def batch_loads(self, ax, theta_rad, mu, drive_type=None, tire=None):
+        # Avalia uma grade inteira de condições de uma vez (broadcast entre todos os argumentos)
+        # e devolve colunas prontas para DataFrame/Parquet
+        if drive_type is None:
+            drive_type = self.drive_type
+        ax, theta_rad, mu, drive = np.broadcast_arrays(
+            np.asarray(ax, dtype=float), np.asarray(theta_rad, dtype=float),
+            np.asarray(mu, dtype=float), drive_index(drive_type))
+        Wf, Wr = self.dynamic_loads(ax, theta_rad)
+        Fmax = self.max_tractive_force(Wf, Wr, mu, drive, tire)
+        F_resist = self.W * (np.sin(theta_rad) + self.fr * np.cos(theta_rad))
+        return {
+            'ax': ax, 'theta': theta_rad, 'mu': mu, 'drive': drive,
+            'Wf': Wf, 'Wr': Wr, 'Fmax': Fmax, 'F_resist': F_resist,
+        }
+
+class Vehicle(VehicleModel):
+    # Registro imutável de parâmetros: sem __dict__ (__slots__), hash estável pelo
+    # conteúdo (pode ser chave de cache) e W calculado uma vez. Os campos podem ser
+    # escalares ou arrays (variantes em broadcast).
+    __slots__ = FIELDS + ('W', '_key', '_hash')
+
+    def __init__(self, M, L, b, c, h, Af, Cd, fr, rho, drive_type, tire_radius, gear_ratios, final_drive, eta_d):
+        values = (M, L, b, c, h, Af, Cd, fr, rho, drive_type, tire_radius, gear_ratios, final_drive, eta_d)
+        for name, value in zip(FIELDS, values):
+            object.__setattr__(self, name, _frozen(value))
+        object.__setattr__(self, 'W', _frozen(M * G))
+        object.__setattr__(self, '_key', None)
+        object.__setattr__(self, '_hash', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Vehicle é imutável; use replace({name}=...)")
+
+    __delattr__ = __setattr__
+
+    def astuple(self):
+        return tuple(getattr(self, name) for name in FIELDS)
+
+    def replace(self, **changes):
+        # Cópia com alguns campos trocados (W é recalculado)
+        values = dict(zip(FIELDS, self.astuple()))
+        values.update(changes)
+        return Vehicle(**values)
+
+    def __reduce__(self):
+        return (Vehicle, self.astuple())
+
+    def key(self):
+        # Chave canônica (arrays -> bytes), base de __eq__/__hash__ e digest
+        if self._key is None:
+            object.__setattr__(self, '_key', freeze(self.astuple()))
+        return self._key
+
+    def digest(self):
+        # Hash estável entre processos e execuções (hash() de str muda com PYTHONHASHSEED)
+        return hashlib.blake2b(repr(self.key()).encode(), digest_size=16).hexdigest()
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(self.key()))
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Vehicle):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __repr__(self):
+        return "Vehicle(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS) + ")"
+
+# Campos numéricos de VehicleBatch (drive_type vira código inteiro e gear_ratios um subarray)
+BATCH_FLOATS = ('M', 'L', 'b', 'c', 'h', 'Af', 'Cd', 'fr', 'rho', 'tire_radius', 'final_drive', 'eta_d')
+
+def batch_dtype(n_gears, float_dtype=np.float64):
+    # Um registro por variante: float64 = 97 + 8*n_marchas bytes; float32 = 49 + 4*n_marchas
+    # (1 milhão de variantes com 5 marchas: ~137 MB / ~69 MB)
+    f = np.dtype(float_dtype)
+    return np.dtype([(name, f) for name in BATCH_FLOATS]
+                    + [('drive_type', np.int8), ('gear_ratios', f, (n_gears,))])
+
+class VehicleBatch(VehicleModel):
+    # N variantes num array estruturado do NumPy. Os atributos (M, h, gear_ratios, ...)
+    # são vistas das colunas, sem cópia, com os mesmos nomes de Vehicle: o lote entra
+    # direto em dynamic_loads, simulate_acceleration, max_launch_grade etc.
+    # Pode morar em memória compartilhada (share/attach): ao ser enviado para outro
+    # processo vai só o nome do bloco, e o processo filho mapeia os mesmos dados.
+    __slots__ = ('data', '_shm')
+
+    def __init__(self, data, shm=None):
+        self.data = data
+        self._shm = shm
+
+    @classmethod
+    def empty(cls, n, n_gears=5, float_dtype=np.float64):
+        return cls(np.zeros(n, dtype=batch_dtype(n_gears, float_dtype)))
+
+    @classmethod
+    def from_fields(cls, n=None, float_dtype=np.float64, **fields):
+        # Campos como em Vehicle (escalares, arrays (N,) ou gear_ratios (N, n_marchas)),
+        # em broadcast para N linhas
+        ratios = np.atleast_2d(np.asarray(fields['gear_ratios'], dtype=float))
+        if n is None:
+            n = np.broadcast(*(fields[k] for k in BATCH_FLOATS), ratios[:, 0]).size
+        batch = cls.empty(n, ratios.shape[1], float_dtype)
+        for name in BATCH_FLOATS:
+            batch.data[name] = fields[name]
+        batch.data['drive_type'] = drive_index(fields['drive_type'])
+        batch.data['gear_ratios'] = ratios
+        return batch
+
+    @classmethod
+    def from_vehicles(cls, vehicles, float_dtype=np.float64):
+        vehicles = list(vehicles)
+        return cls.from_fields(**{name: np.stack([np.asarray(getattr(v, name)) for v in vehicles])
+                                  for name in FIELDS}, float_dtype=float_dtype)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        # Inteiro -> Vehicle; fatia/máscara/índices -> VehicleBatch
+        if isinstance(index, (int, np.integer)):
+            row = self.data[index]
+            values = {name: row[name].item() for name in BATCH_FLOATS}
+            code = int(row['drive_type'])
+            values['drive_type'] = DRIVE_TYPES[code] if code < len(DRIVE_TYPES) else code
+            values['gear_ratios'] = tuple(row['gear_ratios'].tolist())
+            return Vehicle(**values)
+        return VehicleBatch(self.data[index])
+
+    @property
+    def W(self):
+        return self.data['M'] * G
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    # --- MEMÓRIA COMPARTILHADA ---
+    def share(self):
+        # Cópia do lote num bloco de memória compartilhada (o chamador deve unlink() no fim)
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(create=True, size=max(self.data.nbytes, 1))
+        data = np.ndarray(self.data.shape, dtype=self.data.dtype, buffer=shm.buf)
+        data[...] = self.data
+        return VehicleBatch(data, shm)
+
+    @classmethod
+    def attach(cls, name, n, dtype):
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(np.ndarray((n,), dtype=dtype, buffer=shm.buf), shm)
+
+    def __reduce__(self):
+        if self._shm is not None:
+            return (VehicleBatch.attach, (self._shm.name, len(self.data), self.data.dtype))
+        return (VehicleBatch, (self.data,))
+
+    def close(self):
+        if self._shm is not None:
+            self.data = self.data[:0].copy()
+            self._shm.close()
+
+    def unlink(self):
+        if self._shm is not None:
+            shm = self._shm
+            self.close()
+            shm.unlink()
+            self._shm = None
+
+def _column(name):
+    return property(lambda self: self.data[name])
+
+for _name in BATCH_FLOATS + ('drive_type', 'gear_ratios'):
+    setattr(VehicleBatch, _name, _column(_name))
+del _name